@@ -4,7 +4,7 @@ from typing import Literal, assert_never
 from pyreqwest.pytest_plugin import Mock
 from pyreqwest.pytest_plugin.internal.assert_eq import assert_eq
 from pyreqwest.pytest_plugin.internal.matcher import InternalMatcher
-from pyreqwest.request import Request
+from pyreqwest.pytest_plugin.internal.request_context import RequestContext
 
 
 def assert_fail(
@@ -16,12 +16,14 @@ def assert_fail(
 ) -> None:
     msg = _format_counts_assert_message(mock, count, min_count, max_count)
 
-    if mock._unmatched_requests_repr_parts:
-        not_matched = {*mock._unmatched_requests_repr_parts[-1].keys()}
+    if (unmatched := mock._last_unmatched()) is not None:
+        ctx, failed = unmatched
+        not_matched = mock._unmatched_names(ctx, failed)
         assert not_matched
 
         msg = f"{msg}. Diff with last unmatched request:"
-        assert_eq(mock._unmatched_requests_repr_parts[-1], _format_mock_matchers_parts(mock, not_matched), msg)
+        unmatched_parts = format_unmatched_request_parts(ctx, not_matched)
+        assert_eq(unmatched_parts, _format_mock_matchers_parts(mock, not_matched), msg)
     else:
         raise AssertionError(msg)
 
@@ -51,31 +53,26 @@ def _format_counts_assert_message(
     return f'Expected {expected_desc} request(s) but received {len(mock._matched_requests)} to: "{method_path}"'
 
 
-def format_unmatched_request_parts(request: Request, unmatched: set[str]) -> dict[str, str | None]:
+def format_unmatched_request_parts(ctx: RequestContext, unmatched: set[str]) -> dict[str, str | None]:
     req_parts: dict[str, str | None] = {
-        "method": request.method,
-        "url": str(request.url),
-        "path": request.url.path,
+        "method": ctx.method,
+        "url": ctx.url_str,
+        "path": ctx.path,
         "query": None,
         "headers": None,
         "body": None,
     }
 
-    if request.url.query_pairs:
-        query_parts = [f"{k}={v}" for k, v in request.url.query_pairs]
+    if ctx.url.query_pairs:
+        query_parts = [f"{k}={v}" for k, v in ctx.url.query_pairs]
         req_parts["query"] = ", ".join(query_parts)
 
-    if request.headers:
-        header_parts = [f"{name.title()}: {value}" for name, value in request.headers.items()]
+    if ctx.headers:
+        header_parts = [f"{name.title()}: {value}" for name, value in ctx.headers.items()]
         req_parts["headers"] = ", ".join(header_parts)
 
-    if request.body:
-        if (bytes_body := request.body.copy_bytes()) is not None:
-            req_parts["body"] = bytes_body.to_bytes().decode("utf8", errors="replace")
-        elif (stream_body := request.body.get_stream()) is not None:
-            req_parts["body"] = repr(stream_body)
-        else:
-            req_parts["body"] = repr(request.body)
+    if ctx.body is not None:
+        req_parts["body"] = ctx.body_bytes.decode("utf8", errors="replace")
 
     fmt_parts: dict[str, str | None] = {
         "custom": f"No match with request {req_parts}",
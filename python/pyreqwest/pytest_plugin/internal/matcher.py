@@ -1,24 +1,35 @@
-from dataclasses import dataclass
+import re
+from collections.abc import Callable
+from dataclasses import dataclass, field
 from re import Pattern
 from typing import Any
 
 try:
+    from dirty_equals import Contains as _Contains
     from dirty_equals import DirtyEquals as _DirtyEqualsBase
 except ImportError:
     _DirtyEqualsBase = None  # type: ignore[assignment,misc]
+    _Contains = None  # type: ignore[assignment,misc]
 
+_REGEX_SPECIAL_CHARS = frozenset(".^$*+?{}[]\\|()")
 
-@dataclass
+MATCHER_TYPES: tuple[type, ...] = (str, Pattern) if _DirtyEqualsBase is None else (str, Pattern, _DirtyEqualsBase)
+
+
+def is_dirty_equals_class(matcher: Any) -> bool:
+    """Check for a DirtyEquals class used as a matcher without instantiating it, like `IsStr`."""
+    return _DirtyEqualsBase is not None and isinstance(matcher, type) and issubclass(matcher, _DirtyEqualsBase)
+
+
+@dataclass(slots=True)
 class InternalMatcher:
     matcher: Any
     matcher_repr: str = ""
-
-    def matches(self, value: Any) -> bool:
-        if isinstance(self.matcher, Pattern):
-            return self.matcher.search(str(value)) is not None
-        return bool(value == self.matcher)
+    matches: Callable[[Any], bool] = field(init=False, repr=False, compare=False)
 
     def __post_init__(self) -> None:
+        self.matches = _compile(self.matcher)
+
         if _DirtyEqualsBase is not None and isinstance(self.matcher, _DirtyEqualsBase):
             # Need to memoize DirtyEquals repr so it is not messing its repr when doing __eq__:
             # https://dirty-equals.helpmanual.io/latest/usage/#__repr__-and-pytest-compatibility
@@ -32,3 +43,63 @@ class InternalMatcher:
 
     def __repr__(self) -> str:
         return f"Matcher({self.matcher_repr})"
+
+
+def _compile(matcher: Any) -> Callable[[Any], bool]:
+    # Matcher type is resolved once here instead of on every matched value
+    if isinstance(matcher, Pattern):
+        return _compile_pattern(matcher)
+    if _Contains is not None and type(matcher) is _Contains:
+        # Same check as Contains.equals, without the DirtyEquals __eq__ bookkeeping on every matched value
+        contained = matcher.contained_values
+        return lambda value: _contains_all(value, contained)
+    if _DirtyEqualsBase is not None and isinstance(matcher, _DirtyEqualsBase):
+        # DirtyEquals on the left side so its __eq__ is called directly instead of after the value's __eq__
+        return lambda value: bool(matcher == value)
+    return lambda value: bool(value == matcher)
+
+
+def _compile_pattern(pattern: Pattern[Any]) -> Callable[[Any], bool]:
+    if (literal := _literal_pattern(pattern)) is not None:
+        # Searching for a pattern without special characters is a plain substring or prefix check
+        text, anchored = literal
+        if anchored:
+            return lambda value: str(value).startswith(text)
+        return lambda value: text in str(value)
+    if (alternatives := _literal_alternatives(pattern)) is not None:
+        # Alternation of literals, like a method pattern "GET|POST", matches if any of them is a substring
+        return lambda value: _contains_any(str(value), alternatives)
+    search = pattern.search
+    return lambda value: search(str(value)) is not None
+
+
+def _contains_all(value: Any, contained: tuple[Any, ...]) -> bool:
+    try:
+        return all(v in value for v in contained)
+    except (TypeError, ValueError):
+        return False
+
+
+def _contains_any(value: str, alternatives: tuple[str, ...]) -> bool:
+    return any(alternative in value for alternative in alternatives)
+
+
+def _literal_pattern(pattern: Pattern[Any]) -> tuple[str, bool] | None:
+    """Literal text of the pattern and whether it is anchored to the start, or None if it is not a literal."""
+    text = pattern.pattern
+    if not isinstance(text, str) or pattern.flags != re.UNICODE:
+        return None
+    anchored = text.startswith("^")
+    if anchored:
+        text = text[1:]
+        # Trailing ".*" also matches an empty string, so it does not change whether an anchored search matches
+        text = text.removesuffix(".*")
+    return (text, anchored) if _REGEX_SPECIAL_CHARS.isdisjoint(text) else None
+
+
+def _literal_alternatives(pattern: Pattern[Any]) -> tuple[str, ...] | None:
+    text = pattern.pattern
+    if not isinstance(text, str) or pattern.flags != re.UNICODE:
+        return None
+    alternatives = tuple(text.split("|"))
+    return alternatives if all(_REGEX_SPECIAL_CHARS.isdisjoint(alt) for alt in alternatives) else None
@@ -0,0 +1,106 @@
+import json
+import sys
+from typing import TYPE_CHECKING, Any
+
+from pyreqwest.http import HeaderMap, Url
+from pyreqwest.request import Request
+
+if TYPE_CHECKING:
+    from pyreqwest.bytes import Bytes
+
+INVALID_JSON: Any = object()
+_UNSET: Any = object()
+
+
+class RequestContext:
+    """Request values computed once per request and shared by all mocks it is matched against."""
+
+    __slots__ = (
+        "_body_bytes",
+        "_body_json",
+        "_body_text",
+        "_headers",
+        "_query_dict",
+        "_query_string",
+        "_url_str",
+        "body",
+        "method",
+        "path",
+        "request",
+        "url",
+    )
+
+    def __init__(self, request: Request) -> None:
+        self.request = request
+        self.method = sys.intern(request.method)
+        self.url: Url = request.url
+        self.path = self.url.path
+        self._url_str: str | None = None
+        self._query_string: str | None = None
+        self._query_dict: dict[str, str | list[str]] | None = None
+        self._headers: HeaderMap | None = None
+        self._body_bytes: bytes | None = None
+        self._body_text: str | None = None
+        self._body_json: Any = _UNSET
+
+        self.body: Bytes | None = None
+        if (body := request.body) is not None:
+            assert body.get_stream() is None, "Stream should have been consumed into body bytes by mock middleware"
+            self.body = body.copy_bytes()
+            assert self.body is not None, "Unknown body type"
+
+    def detach(self) -> None:
+        """Copy the values still read from the request, so they stay available after the request is sent."""
+        self._headers = self.request.headers.copy()
+
+    @property
+    def url_str(self) -> str:
+        if self._url_str is None:
+            self._url_str = str(self.url)
+        return self._url_str
+
+    @property
+    def query_string(self) -> str:
+        if self._query_string is None:
+            self._query_string = self.url.query_string or ""
+        return self._query_string
+
+    @property
+    def query_dict(self) -> dict[str, str | list[str]]:
+        if self._query_dict is None:
+            self._query_dict = self.url.query_dict_multi_value
+        return self._query_dict
+
+    @property
+    def headers(self) -> HeaderMap:
+        if self._headers is None:
+            self._headers = self.request.headers
+        return self._headers
+
+    @property
+    def body_bytes(self) -> bytes:
+        if self._body_bytes is None:
+            assert self.body is not None
+            self._body_bytes = self.body.to_bytes()
+        return self._body_bytes
+
+    @property
+    def body_text(self) -> str:
+        if self._body_text is None:
+            if self._body_bytes is None:
+                # Decoded straight from the body buffer, without copying it into bytes first
+                assert self.body is not None
+                self._body_text = str(self.body, "utf-8")
+            else:
+                self._body_text = self._body_bytes.decode()
+        return self._body_text
+
+    @property
+    def body_json(self) -> Any:
+        """Body decoded as JSON, or INVALID_JSON if it is not valid JSON."""
+        if self._body_json is _UNSET:
+            try:
+                self._body_json = json.loads(self.body_bytes)
+            except json.JSONDecodeError:
+                self._body_json = INVALID_JSON
+        return self._body_json
@@ -1,16 +1,19 @@
 """Module providing HTTP request mocking capabilities for pyreqwest clients in tests."""
 
-import json
+import inspect
+import sys
 from collections.abc import AsyncIterable, Awaitable, Callable, Iterable
-from functools import cached_property
+from itertools import chain
 from re import Pattern
-from typing import Any, Literal, Self, TypeVar, assert_never
+from typing import TYPE_CHECKING, Any, Literal, Self, TypeVar, cast
 
 import pytest
 
+from pyreqwest.http import Url
 from pyreqwest.middleware import Next, SyncNext
 from pyreqwest.middleware.types import Middleware, SyncMiddleware
-from pyreqwest.pytest_plugin.internal.matcher import InternalMatcher
+from pyreqwest.pytest_plugin.internal.matcher import MATCHER_TYPES, InternalMatcher, is_dirty_equals_class
+from pyreqwest.pytest_plugin.internal.request_context import INVALID_JSON, RequestContext
 from pyreqwest.pytest_plugin.types import (
     BodyContentMatcher,
     CustomHandler,
@@ -25,28 +28,75 @@ from pyreqwest.pytest_plugin.types import (
 from pyreqwest.request import BaseRequestBuilder, Request, RequestBody, RequestBuilder, SyncRequestBuilder
 from pyreqwest.response import BaseResponse, Response, ResponseBuilder, SyncResponse
 
+if TYPE_CHECKING:
+    from pyreqwest.bytes import Bytes
+
 _R = TypeVar("_R", bound=BaseResponse)
 
 
 class Mock:
     """Class representing a single mock rule."""
 
+    __slots__ = (
+        "_body_check",
+        "_body_matcher",
+        "_checks",
+        "_custom_handler",
+        "_custom_handler_async",
+        "_custom_handler_sync",
+        "_custom_matcher",
+        "_custom_matcher_async",
+        "_custom_matcher_sync",
+        "_failed_requests",
+        "_handle_checks",
+        "_header_checks",
+        "_header_matchers",
+        "_matched_requests",
+        "_method_matcher",
+        "_methods",
+        "_mocker_requests",
+        "_path",
+        "_path_matcher",
+        "_position",
+        "_query_matcher",
+        "_response_builder",
+        "_url_matcher",
+    )
+
     def __init__(
         self, method: MethodMatcher | None = None, *, path: PathMatcher | None = None, url: UrlMatcher | None = None
     ) -> None:
         """Do not use directly. Instead, use ClientMocker.mock()."""
+        _check_matcher("method", method)
+        _check_matcher("path", path)
+        _check_matcher("url", url, Url)
         self._method_matcher = InternalMatcher(method) if method is not None else None
+        self._methods = frozenset({sys.intern(method)}) if isinstance(method, str) else None
         self._path_matcher = InternalMatcher(path) if path is not None else None
-        self._url_matcher = InternalMatcher(url) if url is not None else None
+        self._path = path if isinstance(path, str) else None  # Exact path, used for dispatching requests
+        self._url_matcher = _url_matcher(url) if url is not None else None
         self._query_matcher: dict[str, InternalMatcher] | InternalMatcher | None = None
         self._header_matchers: dict[str, InternalMatcher] = {}
+        self._header_checks: tuple[tuple[str, Callable[[Any], bool]], ...] = ()
         self._body_matcher: tuple[InternalMatcher, Literal["content", "json"]] | None = None
+        self._body_check: Callable[[RequestContext], bool] | None = None
         self._custom_matcher: CustomMatcher | None = None
+        self._custom_matcher_async: Callable[[Request], Awaitable[bool]] | None = None
+        self._custom_matcher_sync: Callable[[Request], bool] | None = None
         self._custom_handler: CustomHandler | None = None
+        self._custom_handler_async: Callable[[Request], Awaitable[Response | None]] | None = None
+        self._custom_handler_sync: Callable[[Request], SyncResponse | None] | None = None
+        self._checks: tuple[tuple[str, Callable[[RequestContext], bool]], ...] = ()
+        self._handle_checks: tuple[Callable[[RequestContext], bool], ...] = ()
+        self._compile_checks()
 
         self._matched_requests: list[Request] = []
-        self._unmatched_requests_repr_parts: list[dict[str, str | None]] = []
-        self._using_response_builder = False
+        # Requests handled but rejected by this mock, with the failed callback if the other matchers passed
+        self._failed_requests: dict[RequestContext, Literal["custom", "handler"] | None] = {}
+        # Set by the mocker: requests it dispatched, with the position of the mock that responded
+        self._mocker_requests: list[tuple[RequestContext, int]] = []
+        self._position = 0
+        self._response_builder: ResponseBuilder | None = None
 
     def assert_called(
         self,
@@ -96,228 +146,241 @@ class Mock:
     def match_query(self, query: QueryMatcher) -> Self:
         """Set a matcher to match the entire query string or query parameters."""
         if isinstance(query, dict):
+            for value in query.values():
+                _check_matcher("query", value, list)
             self._query_matcher = {k: InternalMatcher(v) for k, v in query.items()}
         else:
+            _check_matcher("query", query)
             self._query_matcher = InternalMatcher(query)
+        self._compile_checks()
         return self
 
     def match_query_param(self, name: str, value: Matcher) -> Self:
         """Set a matcher to match a specific query parameter."""
+        _check_matcher("query", value, list)
         if not isinstance(self._query_matcher, dict):
             self._query_matcher = {}
         self._query_matcher[name] = InternalMatcher(value)
+        self._compile_checks()
         return self
 
     def match_header(self, name: str, value: Matcher) -> Self:
-        """Set a matcher to match a specific request header."""
-        self._header_matchers[name] = InternalMatcher(value)
+        """Set a matcher to match a specific request header. Header names are case-insensitive."""
+        _check_matcher("header", value)
+        # Header names are case-insensitive
+        self._header_matchers[sys.intern(name.lower())] = InternalMatcher(value)
+        self._header_checks = tuple((name, _header_check(m)) for name, m in self._header_matchers.items())
+        self._compile_checks()
         return self
 
     def match_body(self, matcher: BodyContentMatcher) -> Self:
         """Set a matcher to match request bodies as raw content (text or bytes)."""
-        self._body_matcher = (InternalMatcher(matcher), "content")
+        _check_matcher("body", matcher, bytes)
+        internal_matcher = InternalMatcher(matcher)
+        self._body_matcher = (internal_matcher, "content")
+        self._body_check = _content_body_check(internal_matcher)
+        self._compile_checks()
         return self
 
     def match_body_json(self, matcher: JsonMatcher) -> Self:
         """Set a matcher to match JSON request bodies."""
-        self._body_matcher = (InternalMatcher(matcher), "json")
+        internal_matcher = InternalMatcher(matcher)
+        self._body_matcher = (internal_matcher, "json")
+        self._body_check = _json_body_check(internal_matcher)
+        self._compile_checks()
         return self
 
     def match_request(self, matcher: CustomMatcher) -> Self:
         """Set a custom matcher to match requests."""
         self._custom_matcher = matcher
+        if _is_async_callable(matcher):
+            self._custom_matcher_async = cast("Callable[[Request], Awaitable[bool]]", matcher)
+            self._custom_matcher_sync = None
+        else:
+            self._custom_matcher_async = _async_matcher(matcher)
+            self._custom_matcher_sync = cast("Callable[[Request], bool]", matcher)
         return self
 
     def match_request_with_response(self, handler: CustomHandler) -> Self:
         """Set a custom handler to generate the response for matched requests."""
-        assert not self._using_response_builder, "Cannot use response builder and custom handler together"
+        assert self._response_builder is None, "Cannot use response builder and custom handler together"
         self._custom_handler = handler
+        if _is_async_callable(handler):
+            self._custom_handler_async = cast("Callable[[Request], Awaitable[Response | None]]", handler)
+            self._custom_handler_sync = None
+        else:
+            self._custom_handler_async = _async_handler(handler)
+            self._custom_handler_sync = cast("Callable[[Request], SyncResponse | None]", handler)
         return self
 
     def with_status(self, status: int) -> Self:
         """Set the mocked response status code."""
-        self._response_builder.status(status)
+        self._get_response_builder().status(status)
         return self
 
     def with_header(self, name: str, value: str) -> Self:
         """Add a header to the mocked response."""
-        self._response_builder.header(name, value)
+        self._get_response_builder().header(name, value)
         return self
 
     def with_body_bytes(self, body: bytes | bytearray | memoryview) -> Self:
         """Set the mocked response body to the given bytes."""
-        self._response_builder.body_bytes(body)
+        self._get_response_builder().body_bytes(body)
         return self
 
     def with_body_text(self, body: str) -> Self:
         """Set the mocked response body to the given text."""
-        self._response_builder.body_text(body)
+        self._get_response_builder().body_text(body)
         return self
 
     def with_body_json(self, json_body: Any) -> Self:
         """Set the mocked response body to the given JSON-serializable object."""
-        self._response_builder.body_json(json_body)
+        self._get_response_builder().body_json(json_body)
         return self
 
     def with_version(self, version: str) -> Self:
         """Set the mocked response HTTP version."""
-        self._response_builder.version(version)
+        self._get_response_builder().version(version)
         return self
 
-    def _handle_common_matchers(self, request: Request) -> dict[str, bool]:
-        return {
-            "method": self._matches_method(request),
-            "url": self._matches_url(request),
-            "path": self._matches_path(request),
-            "query": self._match_query(request),
-            "headers": self._match_headers(request),
-            "body": self._match_body(request),
-        }
-
-    async def _handle(self, request: Request) -> Response | None:
-        matches = self._handle_common_matchers(request)
-        response = await self._handle_callbacks(request, matches)
-        return self._check_matched(request, matches, response)
-
-    def _handle_sync(self, request: Request) -> SyncResponse | None:
-        matches = self._handle_common_matchers(request)
-        response = self._handle_callbacks_sync(request, matches)
-        return self._check_matched(request, matches, response)
-
-    async def _handle_callbacks(self, request: Request, matches: dict[str, bool]) -> Response | None:
-        matches["custom"] = await self._matches_custom(request)
-
-        if self._custom_handler:
-            response = await self._handle_custom_handler(request)
-            matches["handler"] = response is not None
-        else:
-            response = await self._response()
-            matches["handler"] = True
-
-        return response if all(matches.values()) else None
-
-    def _handle_callbacks_sync(self, request: Request, matches: dict[str, bool]) -> SyncResponse | None:
-        matches["custom"] = self._matches_custom_sync(request)
-
-        if self._custom_handler:
-            response = self._handle_custom_handler_sync(request)
-            matches["handler"] = response is not None
-        else:
-            response = self._response_sync()
-            matches["handler"] = True
-
-        return response if all(matches.values()) else None
-
-    def _check_matched(self, request: Request, matches: dict[str, bool], response: _R | None) -> _R | None:
-        if response is not None:
-            self._matched_requests.append(request)
-            return response
+    def _compile_checks(self) -> None:
+        checks: list[tuple[str, Callable[[RequestContext], bool]]] = []
+        if self._methods is not None:
+            methods = self._methods
+            checks.append(("method", lambda ctx: ctx.method in methods))
+        elif self._method_matcher is not None:
+            method_matches = self._method_matcher.matches
+            checks.append(("method", lambda ctx: method_matches(ctx.method)))
+        if self._url_matcher is not None:
+            url_matches = self._url_matcher.matches
+            checks.append(("url", lambda ctx: url_matches(ctx.url_str)))
+        if self._path_matcher is not None:
+            path_matches = self._path_matcher.matches
+            checks.append(("path", lambda ctx: path_matches(ctx.path)))
+        if isinstance(self._query_matcher, dict):
+            checks.append(("query", _query_params_check(self._query_matcher)))
+        elif self._query_matcher is not None:
+            checks.append(("query", self._match_query))
+        if self._header_checks:
+            checks.append(("headers", self._match_headers))
+        if self._body_check is not None:
+            checks.append(("body", self._match_body))
+        self._checks = tuple(checks)
+        # The mocker only hands requests with a matching plain method and exact path to this mock
+        dispatched = {"method"} if self._methods is not None else set()
+        if self._path is not None:
+            dispatched.add("path")
+        self._handle_checks = tuple(check for name, check in checks if name not in dispatched)
+
+    def _may_match(self, method: str | None, path: str | None) -> bool:
+        return (self._methods is None or method in self._methods) and (self._path is None or path == self._path)
+
+    def _matches_common(self, ctx: RequestContext) -> bool:
+        return all(check(ctx) for check in self._handle_checks)
+
+    def _failed_common_matchers(self, ctx: RequestContext) -> list[str]:
+        return [name for name, check in self._checks if not check(ctx)]
+
+    async def _handle(self, ctx: RequestContext) -> Response | None:
+        request = ctx.request
+        if not self._matches_common(ctx):
+            self._unmatched(ctx, None)
+            return None
+
+        # Callbacks are only run for requests passing the other matchers
+        if self._custom_matcher_async is not None and not await self._custom_matcher_async(request):
+            self._unmatched(ctx, "custom")
+            return None
+        if self._custom_handler_async is not None:
+            if (response := await self._custom_handler_async(request)) is not None:
+                return self._matched(request, response)
+            self._unmatched(ctx, "handler")
+            return None
+        return self._matched(request, await self._response())
+
+    def _handle_sync(self, ctx: RequestContext) -> SyncResponse | None:
+        request = ctx.request
+        if not self._matches_common(ctx):
+            self._unmatched(ctx, None)
+            return None
+
+        if self._custom_matcher is not None and not self._matches_custom_sync(request):
+            self._unmatched(ctx, "custom")
+            return None
+        if self._custom_handler is not None:
+            if (response := self._handle_custom_handler_sync(request)) is not None:
+                return self._matched(request, response)
+            self._unmatched(ctx, "handler")
+            return None
+        return self._matched(request, self._response_sync())
+
+    def _matched(self, request: Request, response: _R) -> _R:
+        self._matched_requests.append(request)
+        return response
+
+    def _unmatched(self, ctx: RequestContext, failed: Literal["custom", "handler"] | None) -> None:
+        # The failed matchers are resolved only when an assertion fails
+        self._failed_requests[ctx] = failed
+
+    def _last_unmatched(self) -> tuple[RequestContext, Literal["custom", "handler"] | None] | None:
+        for ctx, responded_position in reversed(self._mocker_requests):
+            if self._position >= responded_position:
+                continue  # Added after the request or responded to it
+            if ctx in self._failed_requests:
+                return ctx, self._failed_requests[ctx]
+            if not self._may_match(ctx.method, ctx.path):
+                return ctx, None  # Skipped by the mocker on method or path
+        return None
 
-        from pyreqwest.pytest_plugin.internal.assert_message import format_unmatched_request_parts
+    def _unmatched_names(self, ctx: RequestContext, failed: Literal["custom", "handler"] | None) -> set[str]:
+        return {failed} if failed is not None else {*self._failed_common_matchers(ctx)}
 
-        # Memo the reprs as we may consume the request
-        self._unmatched_requests_repr_parts.append(
-            format_unmatched_request_parts(request, unmatched={k for k, matched in matches.items() if not matched}),
-        )
-        return None
+    def _get_response_builder(self) -> ResponseBuilder:
+        if self._response_builder is None:
+            assert self._custom_handler is None, "Cannot use response builder and custom handler together"
+            self._response_builder = ResponseBuilder()
+        return self._response_builder
 
-    @cached_property
-    def _response_builder(self) -> ResponseBuilder:
-        assert self._custom_handler is None, "Cannot use response builder and custom handler together"
-        self._using_response_builder = True
-        return ResponseBuilder()
+    def _response_builder_copy(self) -> ResponseBuilder:
+        return self._response_builder.copy() if self._response_builder is not None else ResponseBuilder()
 
     async def _response(self) -> Response:
-        built_response = await self._response_builder.copy().build()
+        built_response = await self._response_builder_copy().build()
         assert isinstance(built_response, Response)
         return built_response
 
     def _response_sync(self) -> SyncResponse:
-        built_response = self._response_builder.copy().build_sync()
+        built_response = self._response_builder_copy().build_sync()
         assert isinstance(built_response, SyncResponse)
         return built_response
 
-    def _matches_method(self, request: Request) -> bool:
-        return self._method_matcher is None or self._method_matcher.matches(request.method)
-
-    def _matches_url(self, request: Request) -> bool:
-        return self._url_matcher is None or self._url_matcher.matches(request.url)
-
-    def _matches_path(self, request: Request) -> bool:
-        return self._path_matcher is None or self._path_matcher.matches(request.url.path)
-
-    def _match_headers(self, request: Request) -> bool:
-        for header_name, expected_value in self._header_matchers.items():
-            actual_value = request.headers.get(header_name)
-            if actual_value is None or not expected_value.matches(actual_value):
+    def _match_headers(self, ctx: RequestContext) -> bool:
+        headers_get = ctx.headers.get
+        for header_name, matches in self._header_checks:
+            actual_value = headers_get(header_name)
+            if actual_value is None or not matches(actual_value):
                 return False
         return True
 
-    def _match_body(self, request: Request) -> bool:
-        if self._body_matcher is None:
-            return True
-
-        if request.body is None:
-            return False
-
-        assert request.body.get_stream() is None, "Stream should have been consumed into body bytes by mock middleware"
-        body_buf = request.body.copy_bytes()
-        assert body_buf is not None, "Unknown body type"
-        body_bytes = body_buf.to_bytes()
-
-        matcher, kind = self._body_matcher
-        if kind == "json":
-            try:
-                return matcher.matches(json.loads(body_bytes))
-            except json.JSONDecodeError:
-                return False
-        elif kind == "content":
-            if isinstance(matcher.matcher, bytes):
-                return matcher.matches(body_bytes)
-            return matcher.matches(body_bytes.decode())
-        else:
-            assert_never(kind)
-
-    def _match_query(self, request: Request) -> bool:
-        if self._query_matcher is None:
-            return True
-
-        query_str = request.url.query_string or ""
-        query_dict = request.url.query_dict_multi_value
+    def _match_body(self, ctx: RequestContext) -> bool:
+        assert self._body_check is not None
+        return ctx.body is not None and self._body_check(ctx)
 
-        if isinstance(self._query_matcher, dict):
-            for key, expected_value in self._query_matcher.items():
-                actual_value = query_dict.get(key)
-                if actual_value is None or not expected_value.matches(actual_value):
-                    return False
-            return True
+    def _match_query(self, ctx: RequestContext) -> bool:
+        assert isinstance(self._query_matcher, InternalMatcher)
         if isinstance(self._query_matcher.matcher, str | Pattern):
-            return self._query_matcher.matches(query_str)
-        return self._query_matcher.matches(query_dict)
-
-    async def _matches_custom(self, request: Request) -> bool:
-        if self._custom_matcher is None:
-            return True
-        res = self._custom_matcher(request)
-        assert isinstance(res, Awaitable)
-        return await res
+            return self._query_matcher.matches(ctx.query_string)
+        return self._query_matcher.matches(ctx.query_dict)
 
     def _matches_custom_sync(self, request: Request) -> bool:
-        if self._custom_matcher is None:
-            return True
-        res = self._custom_matcher(request)
+        assert self._custom_matcher_sync is not None, "Async custom matcher can not be used with sync client"
+        res = self._custom_matcher_sync(request)
         assert isinstance(res, bool)
         return res
 
-    async def _handle_custom_handler(self, request: Request) -> Response | None:
-        assert self._custom_handler
-        res = self._custom_handler(request)
-        assert isinstance(res, Awaitable)
-        return await res
-
     def _handle_custom_handler_sync(self, request: Request) -> SyncResponse | None:
-        assert self._custom_handler
-        res = self._custom_handler(request)
+        assert self._custom_handler_sync is not None, "Async custom handler can not be used with sync client"
+        res = self._custom_handler_sync(request)
         assert res is None or isinstance(res, SyncResponse)
         return res
 
@@ -352,7 +415,15 @@ class ClientMocker:
         Instead, use the `client_mocker` fixture or `ClientMocker.create_mocker`.
         """
         self._mocks: list[Mock] = []
+        # Mocks that can match a method and path, in insertion order. Built lazily, keyed by the method and path
+        # only when some mock is limited to them, so the cache is bounded by the mocks instead of the requests.
+        self._candidates: dict[tuple[str | None, str | None], list[Mock]] = {}
+        self._dispatch_methods: set[str] = set()
+        self._dispatch_paths: set[str] = set()
+        self._requests: list[tuple[RequestContext, int]] = []
         self._strict = False
+        self._middleware = self._create_middleware()
+        self._sync_middleware = self._create_sync_middleware()
 
     @staticmethod
     def create_mocker(monkeypatch: pytest.MonkeyPatch) -> "ClientMocker":
@@ -362,13 +433,16 @@ class ClientMocker:
         def setup(klass: type[BaseRequestBuilder], *, is_async: bool) -> None:
             orig_build_consumed = klass.build  # type: ignore[attr-defined]
             orig_build_streamed = klass.build_streamed  # type: ignore[attr-defined]
+            middleware = mocker._middleware if is_async else mocker._sync_middleware
 
-            def build_patch(self: BaseRequestBuilder, orig: Callable[[BaseRequestBuilder], Request]) -> Request:
-                middleware = mocker._create_middleware() if is_async else mocker._create_sync_middleware()
-                return orig(self.with_middleware(middleware))  # type: ignore[attr-defined]
+            def build(self: BaseRequestBuilder) -> Request:
+                return orig_build_consumed(self.with_middleware(middleware))  # type: ignore[attr-defined,no-any-return]
 
-            monkeypatch.setattr(klass, "build", lambda slf: build_patch(slf, orig_build_consumed))
-            monkeypatch.setattr(klass, "build_streamed", lambda slf: build_patch(slf, orig_build_streamed))
+            def build_streamed(self: BaseRequestBuilder) -> Request:
+                return orig_build_streamed(self.with_middleware(middleware))  # type: ignore[attr-defined,no-any-return]
+
+            monkeypatch.setattr(klass, "build", build)
+            monkeypatch.setattr(klass, "build_streamed", build_streamed)
 
         setup(RequestBuilder, is_async=True)
         setup(SyncRequestBuilder, is_async=False)
@@ -380,7 +454,13 @@ class ClientMocker:
     ) -> Mock:
         """Add a mock rule for method and path or URL."""
         mock = Mock(method, path=path, url=url)
+        mock._position = len(self._mocks)
+        mock._mocker_requests = self._requests
         self._mocks.append(mock)
+        self._dispatch_methods.update(mock._methods or ())
+        if mock._path is not None:
+            self._dispatch_paths.add(mock._path)
+        self._candidates.clear()
         return mock
 
     def get(self, *, path: PathMatcher | None = None, url: UrlMatcher | None = None) -> Mock:
@@ -418,60 +498,171 @@ class ClientMocker:
 
     def get_requests(self) -> list[Request]:
         """Get all captured requests in all mocks."""
-        return [request for mock in self._mocks for request in mock.get_requests()]
+        return list(chain.from_iterable(mock._matched_requests for mock in self._mocks))
 
     def get_call_count(self) -> int:
         """Get the total number of calls in all mocks."""
-        return sum(mock.get_call_count() for mock in self._mocks)
+        return sum(len(mock._matched_requests) for mock in self._mocks)
 
     def clear(self) -> None:
         """Remove all mocks."""
+        self._candidates.clear()
+        self._dispatch_methods.clear()
+        self._dispatch_paths.clear()
+        removed_requests = [*self._requests]  # Removed mocks keep the requests dispatched to them
+        for mock in self._mocks:
+            mock._mocker_requests = removed_requests
         self._mocks.clear()
+        self._requests.clear()
 
     def reset_requests(self) -> None:
         """Reset all captured requests in all mocks."""
         for mock in self._mocks:
             mock.reset_requests()
 
+    def _get_candidates(self, ctx: RequestContext) -> list[Mock]:
+        method = ctx.method if ctx.method in self._dispatch_methods else None
+        path = ctx.path if ctx.path in self._dispatch_paths else None
+        if (candidates := self._candidates.get((method, path))) is None:
+            candidates = [mock for mock in self._mocks if mock._may_match(method, path)]
+            self._candidates[method, path] = candidates
+        return candidates
+
     def _create_middleware(self) -> Middleware:
+        # The collections are only mutated in place, so they are bound once for the request loop
+        mocks, get_candidates, record_request = self._mocks, self._get_candidates, self._requests.append
+
         async def mock_middleware(request: Request, next_handler: Next) -> Response:
             if request.body is not None and (stream := request.body.get_stream()) is not None:
                 assert isinstance(stream, AsyncIterable)
-                body = [bytes(chunk) async for chunk in stream]  # Read the body stream into bytes
-                request = request.from_request_and_body(request, RequestBody.from_bytes(b"".join(body)))
-
-            for mock in self._mocks:
-                if (response := await mock._handle(request)) is not None:
+                body = bytearray()  # Read the body stream into a single buffer
+                async for chunk in stream:
+                    body.extend(chunk)
+                request = request.from_request_and_body(request, RequestBody.from_bytes(body))
+
+            ctx = RequestContext(request)
+            for mock in get_candidates(ctx):
+                if (response := await mock._handle(ctx)) is not None:
+                    record_request((ctx, mock._position))
                     return response
+            record_request((ctx, len(mocks)))
 
             # No rule matched
             if self._strict:
-                msg = f"No mock rule matched request: {request.method} {request.url}"
+                msg = f"No mock rule matched request: {ctx.method} {ctx.url_str}"
                 raise AssertionError(msg)
+            ctx.detach()  # Mocks may still read the request for their assertion diffs
             return await next_handler.run(request)  # Proceed normally
 
         return mock_middleware
 
     def _create_sync_middleware(self) -> SyncMiddleware:
+        # The collections are only mutated in place, so they are bound once for the request loop
+        mocks, get_candidates, record_request = self._mocks, self._get_candidates, self._requests.append
+
         def mock_middleware(request: Request, next_handler: SyncNext) -> SyncResponse:
             if request.body is not None and (stream := request.body.get_stream()) is not None:
                 assert isinstance(stream, Iterable)
-                body = [bytes(chunk) for chunk in stream]  # Read the body stream into bytes
-                request = request.from_request_and_body(request, RequestBody.from_bytes(b"".join(body)))
-
-            for mock in self._mocks:
-                if (response := mock._handle_sync(request)) is not None:
+                body = bytearray()  # Read the body stream into a single buffer
+                for chunk in stream:
+                    body.extend(chunk)
+                request = request.from_request_and_body(request, RequestBody.from_bytes(body))
+
+            ctx = RequestContext(request)
+            for mock in get_candidates(ctx):
+                if (response := mock._handle_sync(ctx)) is not None:
+                    record_request((ctx, mock._position))
                     return response
+            record_request((ctx, len(mocks)))
 
             # No rule matched
             if self._strict:
-                msg = f"No mock rule matched request: {request.method} {request.url}"
+                msg = f"No mock rule matched request: {ctx.method} {ctx.url_str}"
                 raise AssertionError(msg)
+            ctx.detach()  # Mocks may still read the request for their assertion diffs
             return next_handler.run(request)  # Proceed normally
 
         return mock_middleware
 
 
+def _check_matcher(kind: str, matcher: Any, *extra_types: type) -> None:
+    supported = isinstance(matcher, (*MATCHER_TYPES, *extra_types)) or is_dirty_equals_class(matcher)
+    if matcher is not None and not supported:
+        msg = f"Unsupported {kind} matcher type: {type(matcher).__name__}"
+        raise TypeError(msg)
+
+
+def _url_matcher(url: UrlMatcher) -> InternalMatcher:
+    if isinstance(url, Url):
+        return InternalMatcher(str(url))
+    if isinstance(url, str) and Url.is_valid(url):
+        matcher = InternalMatcher(str(Url(url)))
+        matcher.matcher_repr = url
+        return matcher
+    return InternalMatcher(url)
+
+
+def _header_check(matcher: InternalMatcher) -> Callable[[Any], bool]:
+    return matcher.matcher.__eq__ if type(matcher.matcher) is str else matcher.matches
+
+
+def _query_params_check(matchers: dict[str, InternalMatcher]) -> Callable[[RequestContext], bool]:
+    checks = tuple((key, matcher.matches) for key, matcher in matchers.items())
+
+    def check(ctx: RequestContext) -> bool:
+        query_dict = ctx.query_dict
+        for key, matches in checks:
+            actual_value = query_dict.get(key)
+            if actual_value is None or not matches(actual_value):
+                return False
+        return True
+
+    return check
+
+
+def _content_body_check(matcher: InternalMatcher) -> Callable[[RequestContext], bool]:
+    if isinstance(matcher.matcher, bytes | str):
+        # Compare lengths before copying the body
+        expected = matcher.matcher if isinstance(matcher.matcher, bytes) else matcher.matcher.encode()
+        expected_len = len(expected)
+        return lambda ctx: len(cast("Bytes", ctx.body)) == expected_len and ctx.body_bytes == expected
+
+    matches = matcher.matches
+    return lambda ctx: matches(ctx.body_text)
+
+
+def _json_body_check(matcher: InternalMatcher) -> Callable[[RequestContext], bool]:
+    matches = matcher.matches
+
+    def check(ctx: RequestContext) -> bool:
+        body = ctx.body_json
+        return body is not INVALID_JSON and matches(body)
+
+    return check
+
+
+def _is_async_callable(func: Callable[..., Any]) -> bool:
+    return inspect.iscoroutinefunction(func) or inspect.iscoroutinefunction(type(func).__call__)
+
+
+def _async_matcher(matcher: CustomMatcher) -> Callable[[Request], Awaitable[bool]]:
+    async def matches(request: Request) -> bool:
+        res = matcher(request)
+        # A sync callable may still return an awaitable, e.g. a lambda calling an async function
+        return await res if inspect.isawaitable(res) else res
+
+    return matches
+
+
+def _async_handler(handler: CustomHandler) -> Callable[[Request], Awaitable[Response | None]]:
+    async def handle(request: Request) -> Response | None:
+        res = handler(request)
+        assert inspect.isawaitable(res), "Sync custom handler can not be used with async client"
+        return await res
+
+    return handle
+
+
 @pytest.fixture
 def client_mocker(monkeypatch: pytest.MonkeyPatch) -> ClientMocker:
     """Fixture that provides a ClientMocker for mocking HTTP requests in tests."""
@@ -11,7 +11,7 @@ from pyreqwest.response import Response, SyncResponse
 try:
     from dirty_equals import DirtyEquals as _DirtyEquals
 
-    Matcher = _DirtyEquals[Any] | str | Pattern[str]
+    Matcher = _DirtyEquals[Any] | type[_DirtyEquals[Any]] | str | Pattern[str]
     JsonMatcher = _DirtyEquals[Any] | Any
 except ImportError:
     Matcher = str | Pattern[str]  # type: ignore[misc]
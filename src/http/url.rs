@@ -14,6 +14,7 @@ use std::sync::OnceLock;
 #[pyclass(frozen)]
 pub struct Url {
     url: url::Url,
+    url_str: OnceLock<Py<PyString>>,
     query: OnceLock<Vec<(Py<PyString>, Py<PyString>)>>,
 }
 
@@ -258,7 +259,10 @@ impl Url {
     }
 
     fn __str__<'py>(&self, py: Python<'py>) -> Bound<'py, PyString> {
-        PyString::new(py, self.as_str())
+        self.url_str
+            .get_or_init_py_attached(py, || PyString::new(py, self.as_str()).unbind())
+            .bind(py)
+            .clone()
     }
 
     fn __repr__(slf: Bound<Self>) -> PyResult<String> {
@@ -312,6 +316,7 @@ impl Url {
     fn new(url: url::Url) -> Self {
         Url {
             url,
+            url_str: OnceLock::new(),
             query: OnceLock::new(),
         }
     }
@@ -1,24 +1,25 @@
 import argparse
 import asyncio
+import os
 import ssl
 import statistics
 import time
 from collections.abc import AsyncGenerator, Awaitable, Callable, Iterator
 from concurrent.futures import ThreadPoolExecutor
-from contextlib import asynccontextmanager
+from contextlib import AsyncExitStack, asynccontextmanager
 from pathlib import Path
+from typing import Any, TypeVar
 
-import matplotlib.pyplot as plt
 import trustme
 from granian.constants import HTTPModes
-from matplotlib.axes import Axes
-from matplotlib.patches import Rectangle
-from pyreqwest.client import ClientBuilder, SyncClientBuilder
+from pyreqwest.client import BaseClientBuilder, Client, ClientBuilder, SyncClient, SyncClientBuilder
 from pyreqwest.http import Url
 
 from tests.servers.echo_server import EchoServer
 from tests.servers.server import EmbeddedServer, ServerConfig, find_free_port
 
+_BuilderT = TypeVar("_BuilderT", bound=BaseClientBuilder)
+
 
 class PerformanceBenchmark:
     """Benchmark class for comparing HTTP client performance."""
@@ -26,9 +27,12 @@ class PerformanceBenchmark:
     def __init__(self, server_url: Url, comparison_lib: str, trust_cert_der: bytes) -> None:
         """Initialize benchmark with echo server and comparison library."""
         self.url = server_url.with_query({"echo_only_body": "1"})
+        self.url_str = str(self.url)
         self.comparison_lib = comparison_lib
         self.is_sync = comparison_lib == "urllib3"
         self.trust_cert_der = trust_cert_der
+        # Comparison libraries share one SSL context, instead of building it again for every benchmark combination
+        self.ssl_ctx = ssl.create_default_context(cadata=trust_cert_der)
         self.body_sizes = [
             10_000,  # 10KB
             100_000,  # 100KB
@@ -37,8 +41,11 @@ class PerformanceBenchmark:
         ]
         self.big_body_limit = 1_000_000
         self.big_body_chunk_size = 1024 * 1024
+        self.max_read_buffer_size = 4 * 1024 * 1024
         self.requests = 100
         self.concurrency_levels = [2, 10, 100]
+        # Same connection pool limits for all clients, so none of them is throttled by its own defaults
+        self.max_connections = max(self.concurrency_levels)
         self.warmup_iterations = 5
         self.iterations = 50
         # Structure {client: {body_size: {concurrency: [times]}}}
@@ -51,35 +58,44 @@ class PerformanceBenchmark:
         return b"x" * size
 
     async def meas_concurrent_batch(self, fn: Callable[[], Awaitable[None]], concurrency: int) -> list[float]:
-        semaphore = asyncio.Semaphore(concurrency)
+        requests = self.requests
 
         async def run() -> float:
-            async def sem_fn() -> None:
-                async with semaphore:
+            pending = iter(range(requests))
+
+            async def worker() -> None:
+                # Workers share the iterator, so each request is run by exactly one of them
+                for _ in pending:
                     await fn()
 
-            start_time = time.perf_counter()
-            await asyncio.gather(*(sem_fn() for _ in range(self.requests)))
-            return (time.perf_counter() - start_time) * 1000
+            start_ns = time.perf_counter_ns()
+            async with asyncio.TaskGroup() as tg:
+                for _ in range(concurrency):
+                    tg.create_task(worker())
+            return (time.perf_counter_ns() - start_ns) / 1_000_000
 
-        print("    Warming up...")
-        _ = [await run() for _ in range(self.warmup_iterations)]
         print("    Running benchmark...")
-        return [await run() for _ in range(self.iterations)]
+        # Warmup runs are measured like the others and only the final iterations are kept
+        times = [await run() for _ in range(self.warmup_iterations + self.iterations)]
+        return times[self.warmup_iterations :]
 
     def sync_meas_concurrent_batch(self, fn: Callable[[], None], concurrency: int) -> list[float]:
         with ThreadPoolExecutor(max_workers=concurrency) as executor:
 
             def run() -> float:
-                start_time = time.perf_counter()
+                start_ns = time.perf_counter_ns()
                 futures = [executor.submit(fn) for _ in range(self.requests)]
                 _ = [f.result() for f in futures]
-                return (time.perf_counter() - start_time) * 1000
+                return (time.perf_counter_ns() - start_ns) / 1_000_000
 
-            print("    Warming up...")
-            _ = [run() for _ in range(self.warmup_iterations)]
             print("    Running benchmark...")
-            return [run() for _ in range(self.iterations)]
+            times = [run() for _ in range(self.warmup_iterations + self.iterations)]
+            return times[self.warmup_iterations :]
+
+    def read_buffer_size(self, body_size: int) -> int:
+        # Larger read buffers for big streamed bodies, used for both pyreqwest and aiohttp to keep them comparable.
+        # Never below aiohttp default high watermark, so small bodies are not read with smaller buffers than before.
+        return max(65536 * 2, min(body_size, self.max_read_buffer_size))
 
     def body_parts_sync(self, body: bytes) -> Iterator[bytes]:
         chunk_size = self.big_body_chunk_size
@@ -90,138 +106,196 @@ class PerformanceBenchmark:
         for part in self.body_parts_sync(body):
             yield part
 
-    async def benchmark_pyreqwest_concurrent(self, body_size: int, concurrency: int) -> list[float]:
+    async def benchmark_pyreqwest_concurrent(self, body_size: int, concurrency: int, client: Client) -> list[float]:
         body = self.generate_body(body_size)
+        url = self.url
+        chunk_size = self.big_body_chunk_size
+        read_buffer_size = self.read_buffer_size(body_size)
+        post = client.post
 
-        async with ClientBuilder().add_root_certificate_der(self.trust_cert_der).https_only(True).build() as client:
+        # Request function is picked once per benchmark, so the body size is not checked again on every request
+        if body_size <= self.big_body_limit:
 
             async def post_read() -> None:
-                if body_size <= self.big_body_limit:
-                    response = await client.post(self.url).body_bytes(body).build().send()
-                    assert len(await response.bytes()) == body_size
-                else:
-                    async with (
-                        client.post(self.url)
-                        .body_stream(self.body_parts(body))
-                        .streamed_read_buffer_limit(65536 * 2)  # Same as aiohttp read buffer high watermark
-                        .build_streamed() as response
-                    ):
-                        tot = 0
-                        while chunk := await response.body_reader.read(self.big_body_chunk_size):
-                            assert len(chunk) <= self.big_body_chunk_size
-                            tot += len(chunk)
-                        assert tot == body_size
-
-            return await self.meas_concurrent_batch(post_read, concurrency)
-
-    def benchmark_sync_pyreqwest_concurrent(self, body_size: int, concurrency: int) -> list[float]:
-        body = self.generate_body(body_size)
+                response = await post(url).body_bytes(body).build().send()
+                assert len(await response.bytes()) == body_size
+        else:
 
-        with SyncClientBuilder().add_root_certificate_der(self.trust_cert_der).https_only(True).build() as client:
+            async def post_read() -> None:
+                async with (
+                    post(url)
+                    .body_stream(self.body_parts(body))
+                    .streamed_read_buffer_limit(read_buffer_size)
+                    .build_streamed() as response
+                ):
+                    read = response.body_reader.read
+                    # Chunks are copied into the full body like a real consumer would, so the copy cost is measured too
+                    buf = memoryview(bytearray(body_size))
+                    tot = 0
+                    while chunk := await read(chunk_size):
+                        size = len(chunk)
+                        assert size <= chunk_size
+                        buf[tot : tot + size] = chunk
+                        tot += size
+                    assert tot == body_size
 
-            def post_read() -> None:
-                if body_size <= self.big_body_limit:
-                    response = client.post(self.url).body_bytes(body).build().send()
-                    assert len(response.bytes()) == body_size
-                else:
-                    with (
-                        client.post(self.url)
-                        .body_stream(self.body_parts_sync(body))
-                        .streamed_read_buffer_limit(65536 * 2)  # Same as aiohttp read buffer high watermark
-                        .build_streamed() as response
-                    ):
-                        tot = 0
-                        while chunk := response.body_reader.read(self.big_body_chunk_size):
-                            assert len(chunk) <= self.big_body_chunk_size
-                            tot += len(chunk)
-                        assert tot == body_size
-
-            return self.sync_meas_concurrent_batch(post_read, concurrency)
-
-    async def benchmark_aiohttp_concurrent(self, body_size: int, concurrency: int) -> list[float]:
-        import aiohttp
+        return await self.meas_concurrent_batch(post_read, concurrency)
 
+    def benchmark_sync_pyreqwest_concurrent(self, body_size: int, concurrency: int, client: SyncClient) -> list[float]:
         body = self.generate_body(body_size)
-        url_str = str(self.url)
-        ssl_ctx = ssl.create_default_context(cadata=self.trust_cert_der)
+        url = self.url
+        chunk_size = self.big_body_chunk_size
+        read_buffer_size = self.read_buffer_size(body_size)
+        post = client.post
 
-        async with aiohttp.ClientSession(connector=aiohttp.TCPConnector(ssl=ssl_ctx, limit=concurrency)) as session:
+        if body_size <= self.big_body_limit:
 
-            async def post_read() -> None:
-                if body_size <= self.big_body_limit:
-                    async with session.post(url_str, data=body) as response:
-                        assert len(await response.read()) == body_size
-                else:
-                    async with session.post(url_str, data=self.body_parts(body)) as response:
-                        tot = 0
-                        async for chunk in response.content.iter_chunked(self.big_body_chunk_size):
-                            assert len(chunk) <= self.big_body_chunk_size
-                            tot += len(chunk)
-                        assert tot == body_size
+            def post_read() -> None:
+                response = post(url).body_bytes(body).build().send()
+                assert len(response.bytes()) == body_size
+        else:
 
-            return await self.meas_concurrent_batch(post_read, concurrency)
+            def post_read() -> None:
+                with (
+                    post(url)
+                    .body_stream(self.body_parts_sync(body))
+                    .streamed_read_buffer_limit(read_buffer_size)
+                    .build_streamed() as response
+                ):
+                    read = response.body_reader.read
+                    buf = memoryview(bytearray(body_size))
+                    tot = 0
+                    while chunk := read(chunk_size):
+                        size = len(chunk)
+                        assert size <= chunk_size
+                        buf[tot : tot + size] = chunk
+                        tot += size
+                    assert tot == body_size
 
-    async def benchmark_httpx_concurrent(self, body_size: int, concurrency: int) -> list[float]:
-        import httpx
+        return self.sync_meas_concurrent_batch(post_read, concurrency)
 
+    async def benchmark_aiohttp_concurrent(self, body_size: int, concurrency: int, session: Any) -> list[float]:
         body = self.generate_body(body_size)
-        url_str = str(self.url)
-        ssl_ctx = ssl.create_default_context(cadata=self.trust_cert_der)
+        url_str = self.url_str
+        chunk_size = self.big_body_chunk_size
+        post = session.post
 
-        async with httpx.AsyncClient(verify=ssl_ctx, limits=httpx.Limits(max_connections=concurrency)) as client:
+        if body_size <= self.big_body_limit:
 
             async def post_read() -> None:
-                if body_size <= self.big_body_limit:
-                    response = await client.post(url_str, content=body)
-                    assert len(await response.aread()) == body_size
-                else:
-                    response = await client.post(url_str, content=self.body_parts(body))
+                async with post(url_str, data=body) as response:
+                    assert len(await response.read()) == body_size
+        else:
+            read_bufsize = self.read_buffer_size(body_size) // 2  # aiohttp high watermark is 2 * read_bufsize
+
+            async def post_read() -> None:
+                async with post(url_str, data=self.body_parts(body), read_bufsize=read_bufsize) as response:
+                    buf = memoryview(bytearray(body_size))
                     tot = 0
-                    async for chunk in response.aiter_bytes(self.big_body_chunk_size):
-                        assert len(chunk) <= self.big_body_chunk_size
-                        tot += len(chunk)
+                    async for chunk in response.content.iter_chunked(chunk_size):
+                        size = len(chunk)
+                        assert size <= chunk_size
+                        buf[tot : tot + size] = chunk
+                        tot += size
                     assert tot == body_size
 
-            return await self.meas_concurrent_batch(post_read, concurrency)
-
-    def benchmark_urllib3_concurrent(self, body_size: int, concurrency: int) -> list[float]:
-        import urllib3
+        return await self.meas_concurrent_batch(post_read, concurrency)
 
+    async def benchmark_httpx_concurrent(self, body_size: int, concurrency: int, client: Any) -> list[float]:
         body = self.generate_body(body_size)
-        url_str = str(self.url)
-        ssl_ctx = ssl.create_default_context(cadata=self.trust_cert_der)
+        url_str = self.url_str
+        chunk_size = self.big_body_chunk_size
+        post = client.post
 
-        with urllib3.PoolManager(maxsize=concurrency, ssl_context=ssl_ctx) as pool:
-            if body_size <= self.big_body_limit:
+        if body_size <= self.big_body_limit:
 
-                def post_read() -> None:
-                    response = pool.request("POST", url_str, body=body)
-                    assert response.status == 200
-                    assert len(response.data) == body_size
-            else:
+            async def post_read() -> None:
+                response = await post(url_str, content=body)
+                assert len(await response.aread()) == body_size
+        else:
 
-                def post_read() -> None:
-                    response = pool.request("POST", url_str, body=self.body_parts_sync(body), preload_content=False)
-                    assert response.status == 200
-                    tot = 0
-                    while chunk := response.read(self.big_body_chunk_size):
-                        assert len(chunk) <= self.big_body_chunk_size
-                        tot += len(chunk)
-                    assert tot == body_size
-                    response.release_conn()
+            async def post_read() -> None:
+                response = await post(url_str, content=self.body_parts(body))
+                buf = memoryview(bytearray(body_size))
+                tot = 0
+                async for chunk in response.aiter_bytes(chunk_size):
+                    size = len(chunk)
+                    assert size <= chunk_size
+                    buf[tot : tot + size] = chunk
+                    tot += size
+                assert tot == body_size
+
+        return await self.meas_concurrent_batch(post_read, concurrency)
+
+    def benchmark_urllib3_concurrent(self, body_size: int, concurrency: int, pool: Any) -> list[float]:
+        body = self.generate_body(body_size)
+        url_str = self.url_str
 
-            return self.sync_meas_concurrent_batch(post_read, concurrency)
+        if body_size <= self.big_body_limit:
 
-    async def benchmark_comparison_lib_concurrent(self, body_size: int, concurrency: int) -> list[float]:
+            def post_read() -> None:
+                response = pool.request("POST", url_str, body=body)
+                assert response.status == 200
+                assert len(response.data) == body_size
+        else:
+
+            def post_read() -> None:
+                response = pool.request("POST", url_str, body=self.body_parts_sync(body), preload_content=False)
+                assert response.status == 200
+                buf = memoryview(bytearray(body_size))
+                tot = 0
+                while chunk := response.read(self.big_body_chunk_size):
+                    size = len(chunk)
+                    assert size <= self.big_body_chunk_size
+                    buf[tot : tot + size] = chunk
+                    tot += size
+                assert tot == body_size
+                response.release_conn()
+
+        return self.sync_meas_concurrent_batch(post_read, concurrency)
+
+    async def benchmark_comparison_lib_concurrent(self, body_size: int, concurrency: int, client: Any) -> list[float]:
         """Dispatch to the appropriate benchmark method based on comparison library."""
         if self.comparison_lib == "aiohttp":
-            return await self.benchmark_aiohttp_concurrent(body_size, concurrency)
+            return await self.benchmark_aiohttp_concurrent(body_size, concurrency, client)
         if self.comparison_lib == "httpx":
-            return await self.benchmark_httpx_concurrent(body_size, concurrency)
+            return await self.benchmark_httpx_concurrent(body_size, concurrency, client)
         if self.comparison_lib == "urllib3":
-            return self.benchmark_urllib3_concurrent(body_size, concurrency)
+            return self.benchmark_urllib3_concurrent(body_size, concurrency, client)
         raise ValueError(f"Unsupported comparison library: {self.comparison_lib}")
 
+    def configure_pyreqwest_builder(self, builder: _BuilderT) -> _BuilderT:
+        return (
+            builder.add_root_certificate_der(self.trust_cert_der)
+            .https_only(True)
+            .max_connections(self.max_connections)
+            .pool_max_idle_per_host(self.max_connections)
+        )
+
+    @asynccontextmanager
+    async def comparison_lib_client(self) -> AsyncGenerator[Any, None]:
+        """Create the comparison library client, shared by all body sizes and concurrency levels."""
+        max_connections = self.max_connections
+        if self.comparison_lib == "aiohttp":
+            import aiohttp
+
+            connector = aiohttp.TCPConnector(ssl=self.ssl_ctx, limit=max_connections)
+            async with aiohttp.ClientSession(connector=connector) as session:
+                yield session
+        elif self.comparison_lib == "httpx":
+            import httpx
+
+            limits = httpx.Limits(max_connections=max_connections, max_keepalive_connections=max_connections)
+            async with httpx.AsyncClient(verify=self.ssl_ctx, limits=limits) as client:
+                yield client
+        elif self.comparison_lib == "urllib3":
+            import urllib3
+
+            with urllib3.PoolManager(maxsize=max_connections, ssl_context=self.ssl_ctx) as pool:
+                yield pool
+        else:
+            raise ValueError(f"Unsupported comparison library: {self.comparison_lib}")
+
     async def run_benchmarks(self) -> None:
         """Run all benchmarks."""
         print("Starting performance benchmarks...")
@@ -237,6 +311,21 @@ class PerformanceBenchmark:
         print(f"Benchmark iterations: {self.iterations}")
         print()
 
+        # Clients are created once, so connection pools stay warm across body sizes and concurrency levels
+        async with AsyncExitStack() as stack:
+            pyreqwest_client: Client | SyncClient
+            if self.is_sync:
+                builder = self.configure_pyreqwest_builder(SyncClientBuilder())
+                pyreqwest_client = stack.enter_context(builder.build())
+            else:
+                async_builder = self.configure_pyreqwest_builder(ClientBuilder())
+                pyreqwest_client = await stack.enter_async_context(async_builder.build())
+            lib_client = await stack.enter_async_context(self.comparison_lib_client())
+
+            await self.run_benchmark_combinations(pyreqwest_client, lib_client)
+
+    async def run_benchmark_combinations(self, client: Client | SyncClient, lib_client: Any) -> None:
+        """Run benchmarks for all body size and concurrency combinations."""
         for body_size in self.body_sizes:
             size_label = f"{body_size // 1000}KB" if body_size < 1_000_000 else f"{body_size // 1_000_000}MB"
             print(f"Benchmarking {size_label} body size...")
@@ -248,19 +337,19 @@ class PerformanceBenchmark:
             for concurrency in self.concurrency_levels:
                 print(f"  Testing concurrency level: {concurrency}")
 
-                if self.is_sync:
+                if isinstance(client, SyncClient):
                     print("    Running sync pyreqwest benchmark...")
-                    pyreqwest_times = self.benchmark_sync_pyreqwest_concurrent(body_size, concurrency)
+                    pyreqwest_times = self.benchmark_sync_pyreqwest_concurrent(body_size, concurrency, client)
                 else:
                     print("    Running async pyreqwest benchmark...")
-                    pyreqwest_times = await self.benchmark_pyreqwest_concurrent(body_size, concurrency)
-                pyreqwest_avg = statistics.mean(pyreqwest_times)
+                    pyreqwest_times = await self.benchmark_pyreqwest_concurrent(body_size, concurrency, client)
+                pyreqwest_avg = statistics.fmean(pyreqwest_times)
                 print(f"    pyreqwest average: {pyreqwest_avg:.4f}ms")
                 self.results["pyreqwest"][body_size][concurrency] = pyreqwest_times
 
                 print(f"    Running {self.comparison_lib} benchmark...")
-                lib_times = await self.benchmark_comparison_lib_concurrent(body_size, concurrency)
-                lib_avg = statistics.mean(lib_times)
+                lib_times = await self.benchmark_comparison_lib_concurrent(body_size, concurrency, lib_client)
+                lib_avg = statistics.fmean(lib_times)
                 print(f"    {self.comparison_lib} average: {lib_avg:.4f}ms")
                 self.results[self.comparison_lib][body_size][concurrency] = lib_times
 
@@ -270,6 +359,12 @@ class PerformanceBenchmark:
 
     def create_plot(self) -> None:
         """Create performance comparison plots."""
+        # Imported only when plotting, so matplotlib startup does not delay the benchmarks. Plots are only saved.
+        os.environ.setdefault("MPLBACKEND", "Agg")
+        import matplotlib.pyplot as plt
+        from matplotlib.axes import Axes
+        from matplotlib.patches import Rectangle
+
         # Create a grid layout - 4 rows * 3 columns for 12 subplots
         fig, axes = plt.subplots(nrows=len(self.body_sizes), ncols=len(self.concurrency_levels), figsize=(18, 16))
         fig.suptitle(f"pyreqwest vs {self.comparison_lib}", fontsize=16, y=0.98)
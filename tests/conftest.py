@@ -61,15 +61,20 @@ def cert_private_key_file(localhost_cert: trustme.LeafCert) -> Generator[Path, N
         yield tmp
 
 
-@pytest.fixture
-async def https_echo_server(
-    server_pool: ServerPool, cert_private_key_file: Path, cert_pem_file: Path, cert_authority_pem: Path
-) -> AsyncGenerator[SubprocessServer]:
-    config = ServerConfig(
+@pytest.fixture(scope="session")
+def https_server_config(cert_private_key_file: Path, cert_pem_file: Path, cert_authority_pem: Path) -> ServerConfig:
+    # Shared config instance, so its cached CA PEM bytes are read from disk once per session
+    return ServerConfig(
         ssl_key=cert_private_key_file,
         ssl_cert=cert_pem_file,
         ssl_ca=cert_authority_pem,
     )
-    async with server_pool.use_server(EchoServer, config) as server:
+
+
+@pytest.fixture
+async def https_echo_server(
+    server_pool: ServerPool, https_server_config: ServerConfig
+) -> AsyncGenerator[SubprocessServer]:
+    async with server_pool.use_server(EchoServer, https_server_config) as server:
         assert str(server.url).startswith("https://")
         yield server
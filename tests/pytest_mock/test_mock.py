@@ -5,7 +5,7 @@ from typing import Any
 
 import pytest
 from dirty_equals import Contains, IsPartialDict, IsStr
-from pyreqwest.client import ClientBuilder, SyncClientBuilder
+from pyreqwest.client import Client, ClientBuilder, SyncClientBuilder
 from pyreqwest.pytest_plugin import ClientMocker
 from pyreqwest.request import Request
 from pyreqwest.response import Response, ResponseBuilder
@@ -15,6 +15,13 @@ from tests.servers.server_subprocess import SubprocessServer
 import_time_client = ClientBuilder().build()
 
 
+@pytest.fixture(scope="module")
+async def client() -> AsyncGenerator[Client, None]:
+    # Mocking is applied when requests are built, so one client is shared by the tests in this module
+    async with ClientBuilder().build() as client:
+        yield client
+
+
 async def test_simple_get_mock(client_mocker: ClientMocker) -> None:
     client_mocker.get(path="/api").with_body_text("Hello World")
 
@@ -25,14 +32,12 @@ async def test_simple_get_mock(client_mocker: ClientMocker) -> None:
     assert client_mocker.get_call_count() == 1
 
 
-async def test_method_specific_mocks(client_mocker: ClientMocker) -> None:
+async def test_method_specific_mocks(client_mocker: ClientMocker, client: Client) -> None:
     mock_get = client_mocker.get(path="/users").with_body_json({"users": []})
     mock_post = client_mocker.post(path="/users").with_status(201).with_body_json({"id": 123})
     mock_put = client_mocker.put(path="/users/123").with_status(202)
     mock_delete = client_mocker.delete(path="/users/123").with_status(204)
 
-    client = ClientBuilder().build()
-
     get_resp = await client.get("http://api.example.invalid/users").build().send()
     assert get_resp.status == 200
     assert await get_resp.json() == {"users": []}
@@ -59,12 +64,10 @@ async def test_method_specific_mocks(client_mocker: ClientMocker) -> None:
     assert mock_delete.get_call_count() == 2
 
 
-async def test_regex_path_matching(client_mocker: ClientMocker) -> None:
+async def test_regex_path_matching(client_mocker: ClientMocker, client: Client) -> None:
     pattern = re.compile(r"/users/\d+")
     client_mocker.strict(True).get(path=pattern).with_body_json({"id": 456, "name": "Test User"})
 
-    client = ClientBuilder().build()
-
     resp1 = await client.get("http://api.example.invalid/users/123").build().send()
     resp2 = await client.get("http://api.example.invalid/users/456").build().send()
     with pytest.raises(AssertionError, match="No mock rule matched request"):
@@ -75,10 +78,9 @@ async def test_regex_path_matching(client_mocker: ClientMocker) -> None:
     assert client_mocker.get_call_count() == 2
 
 
-async def test_url_matching(client_mocker: ClientMocker) -> None:
+async def test_url_matching(client_mocker: ClientMocker, client: Client) -> None:
     client_mocker.strict(True).get(url="https://example.invalid/api").with_body_json({"result": 42}).with_status(202)
 
-    client = ClientBuilder().build()
     resp = await client.get("https://example.invalid/api").build().send()
 
     assert resp.status == 202
@@ -89,15 +91,13 @@ async def test_url_matching(client_mocker: ClientMocker) -> None:
         await client.get("http://example.invalid/api").build().send()
 
 
-async def test_header_matching(client_mocker: ClientMocker) -> None:
+async def test_header_matching(client_mocker: ClientMocker, client: Client) -> None:
     client_mocker.post(path="/data").match_header("Authorization", "Bearer token123").with_status(200).with_body_text(
         "Authorized",
     )
 
     client_mocker.post(path="/data").with_status(401).with_body_text("Unauthorized")
 
-    client = ClientBuilder().build()
-
     auth_resp = (
         await client.post("http://api.example.invalid/data").header("Authorization", "Bearer token123").build().send()
     )
@@ -109,13 +109,29 @@ async def test_header_matching(client_mocker: ClientMocker) -> None:
     assert await unauth_resp.text() == "Unauthorized"
 
 
-async def test_body_matching(client_mocker: ClientMocker) -> None:
+async def test_header_matching_name_case_insensitive(client_mocker: ClientMocker, client: Client) -> None:
+    mock = (
+        client_mocker.strict(True)
+        .get(path="/data")
+        .match_header("X-Api-Key", "first")
+        .match_header("x-api-key", "Secret")
+        .with_body_text("Matched")
+    )
+
+    resp = await client.get("http://api.example.invalid/data").header("X-API-KEY", "Secret").build().send()
+    assert await resp.text() == "Matched"
+    assert mock.get_call_count() == 1
+
+    req = client.get("http://api.example.invalid/data").header("X-API-KEY", "secret").build()
+    with pytest.raises(AssertionError, match="No mock rule matched request"):
+        await req.send()
+
+
+async def test_body_matching(client_mocker: ClientMocker, client: Client) -> None:
     client_mocker.post(path="/echo").match_body('{"test": "data"}').with_body_text("JSON matched")
 
     client_mocker.post(path="/echo").match_body(b"binary data").with_body_text("Binary matched")
 
-    client = ClientBuilder().build()
-
     json_resp = await client.post("http://api.example.invalid/echo").body_text('{"test": "data"}').build().send()
     assert await json_resp.text() == "JSON matched"
 
@@ -123,12 +139,24 @@ async def test_body_matching(client_mocker: ClientMocker) -> None:
     assert await binary_resp.text() == "Binary matched"
 
 
-async def test_regex_body_matching(client_mocker: ClientMocker) -> None:
+async def test_body_matching_exact_length(client_mocker: ClientMocker, client: Client) -> None:
+    mock = client_mocker.strict(True).post(path="/echo").match_body("héllo").with_body_text("Matched")
+
+    resp = await client.post("http://api.example.invalid/echo").body_text("héllo").build().send()
+    assert await resp.text() == "Matched"
+
+    for body in ["héllo!", "héll", "hello", "hallo"]:
+        req = client.post("http://api.example.invalid/echo").body_text(body).build()
+        with pytest.raises(AssertionError, match="No mock rule matched request"):
+            await req.send()
+
+    assert mock.get_call_count() == 1
+
+
+async def test_regex_body_matching(client_mocker: ClientMocker, client: Client) -> None:
     pattern = re.compile(r'.*"action":\s*"create".*')
     client_mocker.post(path="/actions").match_body(pattern).with_status(201).with_body_text("Create action processed")
 
-    client = ClientBuilder().build()
-
     resp = (
         await client.post("http://api.example.invalid/actions")
         .body_text(json.dumps({"action": "create", "resource": "user"}))
@@ -140,12 +168,10 @@ async def test_regex_body_matching(client_mocker: ClientMocker) -> None:
     assert await resp.text() == "Create action processed"
 
 
-async def test_request_capture(client_mocker: ClientMocker) -> None:
+async def test_request_capture(client_mocker: ClientMocker, client: Client) -> None:
     get_mock = client_mocker.get(path="/test").with_body_text("response")
     post_mock = client_mocker.post(path="/test").with_body_text("posted")
 
-    client = ClientBuilder().build()
-
     await client.get("http://api.example.invalid/test").header("User-Agent", "test-client").build().send()
 
     await client.post("http://api.example.invalid/test").body_text(json.dumps({"key": "value"})).build().send()
@@ -163,11 +189,9 @@ async def test_request_capture(client_mocker: ClientMocker) -> None:
     assert post_requests[0].method == "POST"
 
 
-async def test_call_counting(client_mocker: ClientMocker) -> None:
+async def test_call_counting(client_mocker: ClientMocker, client: Client) -> None:
     mock = client_mocker.get(path="/endpoint").with_body_text("response")
 
-    client = ClientBuilder().build()
-
     for _ in range(3):
         await client.get("http://api.example.invalid/endpoint").build().send()
 
@@ -175,45 +199,40 @@ async def test_call_counting(client_mocker: ClientMocker) -> None:
     assert mock.get_call_count() == 3
 
 
-async def test_response_headers(client_mocker: ClientMocker) -> None:
+async def test_response_headers(client_mocker: ClientMocker, client: Client) -> None:
     client_mocker.get(path="/test").with_body_text("Hello").with_header("X-Custom-Header", "custom-value").with_header(
         "x-rate-limit",
         "100",
     )
-    client = ClientBuilder().build()
     resp = await client.get("http://api.example.invalid/test").build().send()
 
     assert resp.headers["X-Custom-Header"] == "custom-value"
     assert resp.headers["X-Rate-Limit"] == "100"
 
 
-async def test_json_response(client_mocker: ClientMocker) -> None:
+async def test_json_response(client_mocker: ClientMocker, client: Client) -> None:
     test_data = {"users": [{"id": 1, "name": "John"}, {"id": 2, "name": "Jane"}]}
     client_mocker.get(path="/users").with_body_json(test_data)
 
-    client = ClientBuilder().build()
     resp = await client.get("http://api.example.invalid/users").build().send()
 
     assert resp.headers["content-type"] == "application/json"
     assert await resp.json() == test_data
 
 
-async def test_bytes_response(client_mocker: ClientMocker) -> None:
+async def test_bytes_response(client_mocker: ClientMocker, client: Client) -> None:
     test_data = b"binary data content"
     client_mocker.get(path="/binary").with_body_bytes(test_data)
 
-    client = ClientBuilder().build()
     resp = await client.get("http://api.example.invalid/binary").build().send()
 
     assert await resp.bytes() == test_data
 
 
-async def test_strict_mode(client_mocker: ClientMocker) -> None:
+async def test_strict_mode(client_mocker: ClientMocker, client: Client) -> None:
     client_mocker.strict(True)
     client_mocker.get(path="/allowed").with_body_text("OK")
 
-    client = ClientBuilder().build()
-
     resp = await client.get("http://api.example.invalid/allowed").build().send()
     assert await resp.text() == "OK"
 
@@ -221,10 +240,9 @@ async def test_strict_mode(client_mocker: ClientMocker) -> None:
         await client.get("http://api.example.invalid/forbidden").build().send()
 
 
-async def test_reset_mocks(client_mocker: ClientMocker) -> None:
+async def test_reset_mocks(client_mocker: ClientMocker, client: Client) -> None:
     client_mocker.get(path="/test").with_body_text("response")
 
-    client = ClientBuilder().build()
     await client.get("http://api.example.invalid/test").build().send()
 
     assert client_mocker.get_call_count() == 1
@@ -236,21 +254,84 @@ async def test_reset_mocks(client_mocker: ClientMocker) -> None:
     assert len(client_mocker.get_requests()) == 0
 
 
-async def test_multiple_rules_first_match_wins(client_mocker: ClientMocker) -> None:
+async def test_multiple_rules_first_match_wins(client_mocker: ClientMocker, client: Client) -> None:
     client_mocker.get(path="/users/123").match_query({"param": "1"}).with_body_text("Specific user")
     client_mocker.get(path="/users/123").with_body_text("General user")
 
-    client = ClientBuilder().build()
     resp = await client.get("http://api.example.invalid/users/123?param=1").build().send()
 
     assert await resp.text() == "Specific user"
 
 
-async def test_method_pattern_matching(client_mocker: ClientMocker) -> None:
+async def test_multiple_rules_first_match_wins_across_methods(client_mocker: ClientMocker, client: Client) -> None:
+    get_specific = client_mocker.get(path="/items").match_query({"id": "1"}).with_body_text("Specific get")
+    any_method = client_mocker.mock(path="/items").with_body_text("Any method")
+    get_general = client_mocker.get(path="/items").with_body_text("General get")
+    post = client_mocker.post(path="/items").with_body_text("Post")
+
+    resp = await client.get("http://api.example.invalid/items?id=1").build().send()
+    assert await resp.text() == "Specific get"
+    for method in ["GET", "POST", "DELETE"]:
+        resp = await client.request(method, "http://api.example.invalid/items").build().send()
+        assert await resp.text() == "Any method"
+
+    assert get_specific.get_call_count() == 1
+    assert any_method.get_call_count() == 3
+    assert get_general.get_call_count() == 0
+    assert post.get_call_count() == 0
+
+
+async def test_exact_path_rules_first_match_wins(client_mocker: ClientMocker, client: Client) -> None:
+    users = client_mocker.get(path="/users").with_body_text("Users")
+    pattern = client_mocker.get(path=re.compile(r"^/users/\d+$")).with_body_text("Pattern")
+
+    resp = await client.get("http://api.example.invalid/users/1").build().send()
+    assert await resp.text() == "Pattern"
+
+    user = client_mocker.get(path="/users/1").with_body_text("User")
+    resp = await client.get("http://api.example.invalid/users/1").build().send()
+    assert await resp.text() == "Pattern"
+    resp = await client.get("http://api.example.invalid/users").build().send()
+    assert await resp.text() == "Users"
+
+    assert users.get_call_count() == 1
+    assert pattern.get_call_count() == 2
+    assert user.get_call_count() == 0
+
+
+async def test_literal_regex_matching(client_mocker: ClientMocker, client: Client) -> None:
     client_mocker.strict(True)
-    client_mocker.mock(re.compile(r"GET|POST"), path="/data").with_body_json({"message": "success"})
+    client_mocker.get(path=re.compile("users")).match_header("X-Tag", re.compile("BETA", re.IGNORECASE)).with_body_text(
+        "Matched"
+    )
+
+    resp = await client.get("http://api.example.invalid/api/users/1").header("X-Tag", "beta-1").build().send()
+    assert await resp.text() == "Matched"
+
+    req = client.get("http://api.example.invalid/api/user/1").header("X-Tag", "beta-1").build()
+    with pytest.raises(AssertionError, match="No mock rule matched request"):
+        await req.send()
+
+    assert client_mocker.get_call_count() == 1
 
-    client = ClientBuilder().build()
+
+async def test_prefix_regex_path_matching(client_mocker: ClientMocker, client: Client) -> None:
+    client_mocker.strict(True)
+    client_mocker.get(path=re.compile("^/api/users/.*")).with_body_text("Matched")
+
+    resp = await client.get("http://api.example.invalid/api/users/1").build().send()
+    assert await resp.text() == "Matched"
+
+    req = client.get("http://api.example.invalid/v2/api/users/1").build()
+    with pytest.raises(AssertionError, match="No mock rule matched request"):
+        await req.send()
+
+    assert client_mocker.get_call_count() == 1
+
+
+async def test_method_pattern_matching(client_mocker: ClientMocker, client: Client) -> None:
+    client_mocker.strict(True)
+    client_mocker.mock(re.compile(r"GET|POST"), path="/data").with_body_json({"message": "success"})
 
     get_resp = await client.get("http://api.example.invalid/data").build().send()
     assert get_resp.status == 200
@@ -267,13 +348,40 @@ async def test_method_pattern_matching(client_mocker: ClientMocker) -> None:
     assert client_mocker.get_call_count() == 2
 
 
+def test_unsupported_matcher_type(client_mocker: ClientMocker) -> None:
+    with pytest.raises(TypeError, match="Unsupported path matcher type: int"):
+        client_mocker.get(path=123)  # type: ignore[arg-type]
+    with pytest.raises(TypeError, match="Unsupported header matcher type: int"):
+        client_mocker.get(path="/data").match_header("X-Count", 1)  # type: ignore[arg-type]
+    with pytest.raises(TypeError, match="Unsupported body matcher type: dict"):
+        client_mocker.post(path="/data").match_body({"key": "value"})  # type: ignore[arg-type]
+
+
+async def test_dirty_equals_class_matchers(client_mocker: ClientMocker, client: Client) -> None:
+    mock = (
+        client_mocker.strict(True)
+        .post(path="/data")
+        .match_header("X-A", IsStr)
+        .match_query({"q": IsStr})
+        .match_body(IsStr)
+        .with_body_text("Matched")
+    )
+
+    resp = await client.post("http://api.example.invalid/data?q=1").header("X-A", "a").body_text("b").build().send()
+    assert await resp.text() == "Matched"
+
+    req = client.post("http://api.example.invalid/data?q=1").body_text("b").build()
+    with pytest.raises(AssertionError, match="No mock rule matched request"):
+        await req.send()
+
+    assert mock.get_call_count() == 1
+
+
 async def test_without_mocking_requests_pass_through(
-    client_mocker: ClientMocker, echo_server: SubprocessServer
+    client_mocker: ClientMocker, echo_server: SubprocessServer, client: Client
 ) -> None:
     client_mocker.get(path="/api").with_body_json({"mocked": True, "source": "mock"})
 
-    client = ClientBuilder().build()
-
     mocked_resp = await client.get("http://mocked.example.invalid/api").build().send()
     assert mocked_resp.status == 200
     mocked_data = await mocked_resp.json()
@@ -293,13 +401,11 @@ async def test_without_mocking_requests_pass_through(
     assert client_mocker.get_call_count() == 1
 
 
-async def test_regex_header_matching(client_mocker: ClientMocker) -> None:
+async def test_regex_header_matching(client_mocker: ClientMocker, client: Client) -> None:
     client_mocker.post(path="/secure").match_header("Authorization", re.compile(r"Bearer \w+")).with_body_json(
         {"authenticated": True},
     )
 
-    client = ClientBuilder().build()
-
     auth_resp = (
         await client.post("http://api.service.invalid/secure")
         .header("Authorization", "Bearer abc123xyz")
@@ -309,14 +415,12 @@ async def test_regex_header_matching(client_mocker: ClientMocker) -> None:
     assert (await auth_resp.json())["authenticated"] is True
 
 
-async def test_mock_chaining_and_reset(client_mocker: ClientMocker) -> None:
+async def test_mock_chaining_and_reset(client_mocker: ClientMocker, client: Client) -> None:
     client_mocker.get(path="/resource").with_status(200).with_body_json({"id": 1, "name": "Resource"}).with_header(
         "X-Rate-Limit",
         "100",
     ).with_header("X-Remaining", "99")
 
-    client = ClientBuilder().build()
-
     resp = await client.get("http://api.service.invalid/resource").build().send()
     assert resp.status == 200
     assert resp.headers["X-Rate-Limit"] == "100"
@@ -376,23 +480,56 @@ async def test_import_time_client_is_mocked(client_mocker: ClientMocker) -> None
     assert client_mocker.get_call_count() == 1
 
 
-async def test_custom_matcher_basic(client_mocker: ClientMocker) -> None:
+async def test_custom_matcher_basic(client_mocker: ClientMocker, client: Client) -> None:
     async def has_api_version(request: Request) -> bool:
         return request.headers.get("X-API-Version") == "v2"
 
     client_mocker.mock().match_request(has_api_version).with_body_text("API v2 response")
     client_mocker.get().with_body_text("Default response")
 
-    client = ClientBuilder().build()
+    v2_resp = await client.get("http://api.example.invalid/data").header("X-API-Version", "v2").build().send()
+    assert await v2_resp.text() == "API v2 response"
+
+    default_resp = await client.get("http://api.example.invalid/data").build().send()
+    assert await default_resp.text() == "Default response"
+
+
+async def test_custom_matcher_sync_callable(client_mocker: ClientMocker, client: Client) -> None:
+    def has_api_version(request: Request) -> bool:
+        return request.headers.get("X-API-Version") == "v2"
+
+    client_mocker.mock().match_request(has_api_version).with_body_text("API v2 response")
+    client_mocker.get().with_body_text("Default response")
+
+    v2_resp = await client.get("http://api.example.invalid/data").header("X-API-Version", "v2").build().send()
+    assert await v2_resp.text() == "API v2 response"
+
+    default_resp = await client.get("http://api.example.invalid/data").build().send()
+    assert await default_resp.text() == "Default response"
+
+
+async def test_custom_matcher_and_handler_returning_awaitable(client_mocker: ClientMocker, client: Client) -> None:
+    async def has_api_version(request: Request, version: str) -> bool:
+        return request.headers.get("X-API-Version") == version
+
+    async def handler(request: Request, body: str) -> Response | None:
+        return await ResponseBuilder().body_text(body).build() if request.method == "POST" else None
+
+    client_mocker.mock().match_request(lambda r: has_api_version(r, "v2")).with_body_text("API v2 response")
+    client_mocker.mock().match_request_with_response(lambda r: handler(r, "Handled"))
+    client_mocker.mock().with_body_text("Default response")
 
     v2_resp = await client.get("http://api.example.invalid/data").header("X-API-Version", "v2").build().send()
     assert await v2_resp.text() == "API v2 response"
 
+    handled_resp = await client.post("http://api.example.invalid/data").build().send()
+    assert await handled_resp.text() == "Handled"
+
     default_resp = await client.get("http://api.example.invalid/data").build().send()
     assert await default_resp.text() == "Default response"
 
 
-async def test_custom_matcher_combined(client_mocker: ClientMocker) -> None:
+async def test_custom_matcher_combined(client_mocker: ClientMocker, client: Client) -> None:
     async def has_user_agent(request: Request) -> bool:
         return "TestClient" in request.headers.get("User-Agent", "")
 
@@ -402,8 +539,6 @@ async def test_custom_matcher_combined(client_mocker: ClientMocker) -> None:
 
     client_mocker.get(path="/protected").with_body_text("Fallback response")
 
-    client = ClientBuilder().build()
-
     success_resp = (
         await client.get("http://api.example.invalid/protected")
         .header("Authorization", "Bearer valid-token")
@@ -431,7 +566,7 @@ async def test_custom_matcher_combined(client_mocker: ClientMocker) -> None:
     assert await wrong_auth_resp.text() == "Fallback response"
 
 
-async def test_custom_handler_basic(client_mocker: ClientMocker) -> None:
+async def test_custom_handler_basic(client_mocker: ClientMocker, client: Client) -> None:
     async def echo_handler(request: Request) -> Response | None:
         if request.method == "POST" and "echo" in str(request.url):
             response_builder = (
@@ -451,8 +586,6 @@ async def test_custom_handler_basic(client_mocker: ClientMocker) -> None:
     client_mocker.mock().match_request_with_response(echo_handler)
     client_mocker.get(path="/test").with_body_text("Default response")
 
-    client = ClientBuilder().build()
-
     echo_resp = await client.post("http://api.example.invalid/echo").header("X-Test", "custom-value").build().send()
 
     assert echo_resp.status == 200
@@ -465,7 +598,7 @@ async def test_custom_handler_basic(client_mocker: ClientMocker) -> None:
     assert await default_resp.text() == "Default response"
 
 
-async def test_custom_handler_with_body_inspection(client_mocker: ClientMocker) -> None:
+async def test_custom_handler_with_body_inspection(client_mocker: ClientMocker, client: Client) -> None:
     async def conditional_handler(request: Request) -> Response | None:
         if request.body is None:
             return None
@@ -494,8 +627,6 @@ async def test_custom_handler_with_body_inspection(client_mocker: ClientMocker)
     mock_cond = client_mocker.mock().match_request_with_response(conditional_handler)
     mock_403 = client_mocker.post(path="/actions").with_status(403).with_body_text("Forbidden")
 
-    client = ClientBuilder().build()
-
     admin_resp = (
         await client.post("http://api.example.invalid/actions")
         .body_text(json.dumps({"role": "admin", "action": "delete", "user": "alice"}))
@@ -522,14 +653,32 @@ async def test_custom_handler_with_body_inspection(client_mocker: ClientMocker)
     assert client_mocker.get_call_count() == 2
 
 
-async def test_get_call_count_comprehensive(client_mocker: ClientMocker) -> None:
+async def test_custom_handler_not_called_for_unmatched_request(client_mocker: ClientMocker, client: Client) -> None:
+    handled: list[str] = []
+
+    async def handler(request: Request) -> Response | None:
+        handled.append(request.method)
+        return await ResponseBuilder().body_text("Handled").build()
+
+    handler_mock = client_mocker.post(path="/handled").match_request_with_response(handler)
+    client_mocker.get(path="/other").with_body_text("Other")
+
+    resp = await client.get("http://api.example.invalid/other").build().send()
+    assert await resp.text() == "Other"
+    assert handled == []
+
+    resp = await client.post("http://api.example.invalid/handled").build().send()
+    assert await resp.text() == "Handled"
+    assert handled == ["POST"]
+    assert handler_mock.get_call_count() == 1
+
+
+async def test_get_call_count_comprehensive(client_mocker: ClientMocker, client: Client) -> None:
     users_get_mock = client_mocker.get(path="/users").with_body_json({"users": []})
     users_post_mock = client_mocker.post(path="/users").with_status(201).with_body_json({"id": 1})
     posts_get_mock = client_mocker.get(path="/posts").with_body_json({"posts": []})
     other_put_mock = client_mocker.put(path="/data").with_status(200).with_body_text("updated")
 
-    client = ClientBuilder().build()
-
     assert client_mocker.get_call_count() == 0
     assert users_get_mock.get_call_count() == 0
     assert users_post_mock.get_call_count() == 0
@@ -560,7 +709,7 @@ async def test_get_call_count_comprehensive(client_mocker: ClientMocker) -> None
     assert other_put_mock.get_call_count() == 1
 
 
-async def test_get_call_count_with_custom_handlers(client_mocker: ClientMocker) -> None:
+async def test_get_call_count_with_custom_handlers(client_mocker: ClientMocker, client: Client) -> None:
     call_count = 0
 
     async def custom_handler(request: Request) -> Response | None:
@@ -573,8 +722,6 @@ async def test_get_call_count_with_custom_handlers(client_mocker: ClientMocker)
     custom_mock = client_mocker.mock().match_request_with_response(custom_handler)
     normal_mock = client_mocker.get(path="/normal").with_body_text("Normal response")
 
-    client = ClientBuilder().build()
-
     assert client_mocker.get_call_count() == 0
 
     resp1 = await client.get("http://api.example.invalid/custom").build().send()
@@ -593,12 +740,10 @@ async def test_get_call_count_with_custom_handlers(client_mocker: ClientMocker)
     assert normal_mock.get_call_count() == 1
 
 
-async def test_get_call_count_after_reset(client_mocker: ClientMocker) -> None:
+async def test_get_call_count_after_reset(client_mocker: ClientMocker, client: Client) -> None:
     get_mock = client_mocker.get(path="/test").with_body_text("test")
     post_mock = client_mocker.post(path="/test").with_body_text("posted")
 
-    client = ClientBuilder().build()
-
     await client.get("http://api.example.invalid/test").build().send()
     await client.post("http://api.example.invalid/test").body_text("data").build().send()
     await client.get("http://api.example.invalid/test").build().send()
@@ -615,11 +760,9 @@ async def test_get_call_count_after_reset(client_mocker: ClientMocker) -> None:
     assert len(client_mocker.get_requests()) == 0
 
 
-async def test_get_call_count_edge_cases(client_mocker: ClientMocker) -> None:
+async def test_get_call_count_edge_cases(client_mocker: ClientMocker, client: Client) -> None:
     mock = client_mocker.strict(True).get(path="/").with_body_text("response")
 
-    client = ClientBuilder().build()
-
     assert client_mocker.get_call_count() == 0
     assert mock.get_call_count() == 0
 
@@ -630,14 +773,12 @@ async def test_get_call_count_edge_cases(client_mocker: ClientMocker) -> None:
     assert mock.get_call_count() == 1
 
 
-async def test_query_matching_dict_string_values(client_mocker: ClientMocker) -> None:
+async def test_query_matching_dict_string_values(client_mocker: ClientMocker, client: Client) -> None:
     client_mocker.get(path="/search").match_query({"q": "python", "type": "repo"}).with_body_json(
         {"results": ["pyreqwest"]}
     )
     client_mocker.get(path="/search").with_body_json({"results": []})
 
-    client = ClientBuilder().build()
-
     match_resp = await client.get("http://api.example.invalid/search?q=python&type=repo").build().send()
     assert await match_resp.json() == {"results": ["pyreqwest"]}
 
@@ -648,7 +789,7 @@ async def test_query_matching_dict_string_values(client_mocker: ClientMocker) ->
     assert await missing_resp.json() == {"results": []}
 
 
-async def test_query_matching_dict_regex_values(client_mocker: ClientMocker) -> None:
+async def test_query_matching_dict_regex_values(client_mocker: ClientMocker, client: Client) -> None:
     client_mocker.get(path="/search").match_query(
         {"q": re.compile(r"py.*"), "limit": re.compile(r"\d+")}
     ).with_body_json(
@@ -656,8 +797,6 @@ async def test_query_matching_dict_regex_values(client_mocker: ClientMocker) ->
     )
     client_mocker.get(path="/search").with_body_json({"matched": False})
 
-    client = ClientBuilder().build()
-
     match_resp = await client.get("http://api.example.invalid/search?q=python&limit=10").build().send()
     assert await match_resp.json() == {"matched": True}
 
@@ -668,12 +807,10 @@ async def test_query_matching_dict_regex_values(client_mocker: ClientMocker) ->
     assert await no_match_resp.json() == {"matched": False}
 
 
-async def test_query_matching_regex_pattern(client_mocker: ClientMocker) -> None:
+async def test_query_matching_regex_pattern(client_mocker: ClientMocker, client: Client) -> None:
     client_mocker.get(path="/data").match_query(re.compile(r".*token=\w+.*")).with_body_json({"authorized": True})
     client_mocker.get(path="/data").with_body_json({"authorized": False})
 
-    client = ClientBuilder().build()
-
     auth_resp = await client.get("http://api.example.invalid/data?token=abc123&other=value").build().send()
     assert await auth_resp.json() == {"authorized": True}
 
@@ -684,12 +821,10 @@ async def test_query_matching_regex_pattern(client_mocker: ClientMocker) -> None
     assert await empty_resp.json() == {"authorized": False}
 
 
-async def test_query_matching_empty(client_mocker: ClientMocker) -> None:
+async def test_query_matching_empty(client_mocker: ClientMocker, client: Client) -> None:
     client_mocker.get(path="/endpoint").match_query("").with_body_json({"no_params": True})
     client_mocker.get(path="/endpoint").with_body_json({"has_params": True})
 
-    client = ClientBuilder().build()
-
     no_params_resp = await client.get("http://api.example.invalid/endpoint").build().send()
     assert await no_params_resp.json() == {"no_params": True}
 
@@ -697,14 +832,12 @@ async def test_query_matching_empty(client_mocker: ClientMocker) -> None:
     assert await with_params_resp.json() == {"has_params": True}
 
 
-async def test_query_matching_regex_empty_string(client_mocker: ClientMocker) -> None:
+async def test_query_matching_regex_empty_string(client_mocker: ClientMocker, client: Client) -> None:
     client_mocker.get(path="/flexible").match_query(re.compile(r"^$|.*debug=true.*")).with_body_json(
         {"debug_or_empty": True},
     )
     client_mocker.get(path="/flexible").with_body_json({"other": True})
 
-    client = ClientBuilder().build()
-
     empty_resp = await client.get("http://api.example.invalid/flexible").build().send()
     assert await empty_resp.json() == {"debug_or_empty": True}
 
@@ -715,13 +848,11 @@ async def test_query_matching_regex_empty_string(client_mocker: ClientMocker) ->
     assert await other_resp.json() == {"other": True}
 
 
-async def test_query_matching_multiple_values_same_key(client_mocker: ClientMocker) -> None:
+async def test_query_matching_multiple_values_same_key(client_mocker: ClientMocker, client: Client) -> None:
     client_mocker.get(path="/multi").match_query({"tag": ["python", "web"]}).with_body_json({"match": 1})
     client_mocker.get(path="/multi").match_query({"tag": Contains("rust")}).with_body_json({"match": 2})
     client_mocker.get(path="/multi").with_body_json({"no_match": True})
 
-    client = ClientBuilder().build()
-
     resp1 = await client.get("http://api.example.invalid/multi?tag=python&tag=web").build().send()
     assert await resp1.json() == {"match": 1}
 
@@ -732,7 +863,7 @@ async def test_query_matching_multiple_values_same_key(client_mocker: ClientMock
     assert await no_match_resp.json() == {"no_match": True}
 
 
-async def test_query_matching_mixed_string_and_regex(client_mocker: ClientMocker) -> None:
+async def test_query_matching_mixed_string_and_regex(client_mocker: ClientMocker, client: Client) -> None:
     client_mocker.get(path="/mixed").match_query(
         {
             "exact": "value",
@@ -741,33 +872,27 @@ async def test_query_matching_mixed_string_and_regex(client_mocker: ClientMocker
         },
     ).with_body_json({"mixed_match": True})
 
-    client = ClientBuilder().build()
-
     match_resp = (
         await client.get("http://api.example.invalid/mixed?exact=value&pattern=test_123&optional=").build().send()
     )
     assert await match_resp.json() == {"mixed_match": True}
 
 
-async def test_query_matching_url_encoded_values(client_mocker: ClientMocker) -> None:
+async def test_query_matching_url_encoded_values(client_mocker: ClientMocker, client: Client) -> None:
     client_mocker.get(path="/encoded").match_query({"search": "hello world", "special": "a+b=c"}).with_body_json(
         {"encoded_match": True},
     )
 
-    client = ClientBuilder().build()
-
     encoded_resp = (
         await client.get("http://api.example.invalid/encoded?search=hello%20world&special=a%2Bb%3Dc").build().send()
     )
     assert await encoded_resp.json() == {"encoded_match": True}
 
 
-async def test_query_matching_case_sensitivity(client_mocker: ClientMocker) -> None:
+async def test_query_matching_case_sensitivity(client_mocker: ClientMocker, client: Client) -> None:
     client_mocker.get(path="/case").match_query({"Key": "Value"}).with_body_json({"case_match": True})
     client_mocker.get(path="/case").with_body_json({"no_match": True})
 
-    client = ClientBuilder().build()
-
     exact_resp = await client.get("http://api.example.invalid/case?Key=Value").build().send()
     assert await exact_resp.json() == {"case_match": True}
 
@@ -775,7 +900,7 @@ async def test_query_matching_case_sensitivity(client_mocker: ClientMocker) -> N
     assert await wrong_case_resp.json() == {"no_match": True}
 
 
-async def test_query_matching_with_other_matchers(client_mocker: ClientMocker) -> None:
+async def test_query_matching_with_other_matchers(client_mocker: ClientMocker, client: Client) -> None:
     client_mocker.post(path="/combined").match_query({"action": "create"}).match_header(
         "Content-Type",
         "application/json",
@@ -783,8 +908,6 @@ async def test_query_matching_with_other_matchers(client_mocker: ClientMocker) -
 
     client_mocker.post(path="/combined").with_body_json({"partial_match": True})
 
-    client = ClientBuilder().build()
-
     full_match_resp = (
         await client.post("http://api.example.invalid/combined?action=create")
         .header("Content-Type", "application/json")
@@ -804,11 +927,9 @@ async def test_query_matching_with_other_matchers(client_mocker: ClientMocker) -
     assert await partial_resp.json() == {"partial_match": True}
 
 
-async def test_query_matching_request_capture(client_mocker: ClientMocker) -> None:
+async def test_query_matching_request_capture(client_mocker: ClientMocker, client: Client) -> None:
     query_mock = client_mocker.get(path="/capture").match_query({"filter": "active"}).with_body_json({"captured": True})
 
-    client = ClientBuilder().build()
-
     await client.get("http://api.example.invalid/capture?filter=active&sort=name").build().send()
     await client.get("http://api.example.invalid/capture?filter=active").build().send()
 
@@ -824,13 +945,11 @@ async def test_query_matching_request_capture(client_mocker: ClientMocker) -> No
     assert second_request.url.query_dict_multi_value == {"filter": "active"}
 
 
-async def test_json_body_matching_basic(client_mocker: ClientMocker) -> None:
+async def test_json_body_matching_basic(client_mocker: ClientMocker, client: Client) -> None:
     client_mocker.strict(True).post(path="/users").match_body_json({"name": "John", "age": 30}).with_status(
         201,
     ).with_body_json({"id": 123})
 
-    client = ClientBuilder().build()
-
     resp = await client.post("http://api.example.invalid/users").body_json({"name": "John", "age": 30}).build().send()
     assert resp.status == 201 and await resp.json() == {"id": 123}
 
@@ -839,13 +958,11 @@ async def test_json_body_matching_basic(client_mocker: ClientMocker) -> None:
         await req.send()
 
 
-async def test_json_body_matching_with_custom_equals(client_mocker: ClientMocker) -> None:
+async def test_json_body_matching_with_custom_equals(client_mocker: ClientMocker, client: Client) -> None:
     client_mocker.strict(True).post(path="/partial").match_body_json(
         IsPartialDict(name=IsStr, action="create"),
     ).with_body_text("Partial match successful")
 
-    client = ClientBuilder().build()
-
     resp1 = (
         await client.post("http://api.example.invalid/partial")
         .body_json({"name": "Alice", "action": "create", "extra": "ignored"})
@@ -859,11 +976,9 @@ async def test_json_body_matching_with_custom_equals(client_mocker: ClientMocker
         await req.send()
 
 
-async def test_json_body_matching_invalid(client_mocker: ClientMocker) -> None:
+async def test_json_body_matching_invalid(client_mocker: ClientMocker, client: Client) -> None:
     client_mocker.strict(True).post(path="/strict").match_body_json({"required": "value"}).with_body_text("Matched")
 
-    client = ClientBuilder().build()
-
     with pytest.raises(AssertionError, match="No mock rule matched request"):
         await client.post("http://api.example.invalid/strict").body_text('{"required": value}').build().send()
 
@@ -1,3 +1,4 @@
+import asyncio
 import json
 import re
 from collections.abc import Generator
@@ -10,6 +11,8 @@ from pyreqwest.request import Request
 from pyreqwest.response import Response, ResponseBuilder
 from syrupy import SnapshotAssertion  # type: ignore[attr-defined]
 
+from tests.servers.server_subprocess import SubprocessServer
+
 ANSI_REGEX = re.compile(r"\x1B\[[0-9;]*[mK]")
 
 
@@ -24,7 +27,7 @@ def set_verbosity(request: pytest.FixtureRequest) -> Generator[None]:
         request.config.option.verbose = prev_verbosity
 
 
-@pytest.fixture
+@pytest.fixture(scope="module")
 def client() -> Client:
     return ClientBuilder().build()
 
@@ -51,13 +54,23 @@ async def test_assert_called_default_exactly_once_failure(
     assert _clean_snapshot(str(exc_info.value)) == snapshot
 
 
-async def test_assert_called_exact_count_success(client_mocker: ClientMocker, client: Client) -> None:
+@pytest.mark.parametrize(
+    ("sends", "kwargs"),
+    [
+        (3, {"count": 3}),
+        (5, {"min_count": 3}),
+        (2, {"max_count": 3}),
+        (3, {"min_count": 2, "max_count": 5}),
+    ],
+)
+async def test_assert_called_count_success(
+    client_mocker: ClientMocker, client: Client, sends: int, kwargs: dict[str, int]
+) -> None:
     mock = client_mocker.get(path="/test").with_body_text("response")
 
-    for _ in range(3):
-        await client.get("http://api.example.invalid/test").build().send()
+    await asyncio.gather(*(client.get("http://api.example.invalid/test").build().send() for _ in range(sends)))
 
-    mock.assert_called(count=3)
+    mock.assert_called(**kwargs)
 
 
 async def test_assert_called_exact_count_failure(
@@ -101,15 +114,6 @@ async def test_assert_called_exact_count_failure(
     assert _clean_snapshot(str(exc_info.value)) == snapshot
 
 
-async def test_assert_called_min_count_success(client_mocker: ClientMocker, client: Client) -> None:
-    mock = client_mocker.get(path="/test").with_body_text("response")
-
-    for _ in range(5):
-        await client.get("http://api.example.invalid/test").build().send()
-
-    mock.assert_called(min_count=3)
-
-
 async def test_assert_called_min_count_failure(
     client_mocker: ClientMocker, client: Client, snapshot: SnapshotAssertion
 ) -> None:
@@ -126,22 +130,12 @@ async def test_assert_called_min_count_failure(
     assert _clean_snapshot(str(exc_info.value)) == snapshot
 
 
-async def test_assert_called_max_count_success(client_mocker: ClientMocker, client: Client) -> None:
-    mock = client_mocker.get(path="/test").with_body_text("response")
-
-    for _ in range(2):
-        await client.get("http://api.example.invalid/test").build().send()
-
-    mock.assert_called(max_count=3)
-
-
 async def test_assert_called_max_count_failure(
     client_mocker: ClientMocker, client: Client, snapshot: SnapshotAssertion
 ) -> None:
     mock = client_mocker.get(path="/test").with_body_text("response")
 
-    for _ in range(5):
-        await client.get("http://api.example.invalid/test").build().send()
+    await asyncio.gather(*(client.get("http://api.example.invalid/test").build().send() for _ in range(5)))
 
     with pytest.raises(AssertionError, match=re.escape("request(s) but received")) as exc_info:
         mock.assert_called(max_count=3)
@@ -149,15 +143,6 @@ async def test_assert_called_max_count_failure(
     assert _clean_snapshot(str(exc_info.value)) == snapshot
 
 
-async def test_assert_called_min_max_range_success(client_mocker: ClientMocker, client: Client) -> None:
-    mock = client_mocker.get(path="/test").with_body_text("response")
-
-    for _ in range(3):
-        await client.get("http://api.example.invalid/test").build().send()
-
-    mock.assert_called(min_count=2, max_count=5)
-
-
 async def test_assert_called_min_max_range_failure(
     client_mocker: ClientMocker, client: Client, snapshot: SnapshotAssertion
 ) -> None:
@@ -381,6 +366,22 @@ async def test_dirty_equals_matcher_repr(
     assert _clean_snapshot(str(exc_info.value)) == snapshot
 
 
+async def test_assert_called_diff_with_passed_through_request(
+    client_mocker: ClientMocker, client: Client, echo_server: SubprocessServer
+) -> None:
+    mock = client_mocker.post().match_header("X-Test", "expected").match_body("expected body")
+
+    resp = await client.post(echo_server.url).header("X-Test", "actual").body_text("actual body").build().send()
+    assert resp.status == 200
+
+    with pytest.raises(AssertionError, match=re.escape("request(s) but received")) as exc_info:
+        mock.assert_called()
+
+    msg = _clean_snapshot(str(exc_info.value))
+    assert "X-Test: actual" in msg
+    assert "actual body" in msg
+
+
 def _clean_snapshot(val: str) -> str:
     res = ANSI_REGEX.sub("", val)  # Remove ANSI codes
     if "Differing items:" in res:
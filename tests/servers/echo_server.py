@@ -24,22 +24,23 @@ class EchoServer:
         if sleep_start := float(query_dict.get("sleep_start", 0)):
             await asyncio.sleep(sleep_start)
 
-        if query_dict.get("echo_only_body") == "1":
+        echo_only_body = query_dict.get("echo_only_body") == "1"
+        if echo_only_body:
             resp_body = b"".join([b async for b in receive_all(receive)])
             resp_headers = [[b"content-type", b"application/octet-stream"]]
         else:
             resp = {
-                "headers": scope["headers"],
+                "headers": [(k.decode(), v.decode()) for k, v in scope["headers"]],
                 "http_version": scope["http_version"],
                 "method": scope["method"],
                 "path": scope["path"],
                 "query": query,
-                "raw_path": scope["raw_path"],
+                "raw_path": scope["raw_path"].decode(),
                 "scheme": scope["scheme"],
-                "body_parts": [b async for b in receive_all(receive)],
+                "body_parts": [b.decode() async for b in receive_all(receive)],
                 "time": datetime.now(UTC).isoformat(),
             }
-            resp_body = json_dump(resp)
+            resp_body = json.dumps(resp).encode()
             resp_headers = [[b"content-type", b"application/json"]]
 
         if query_dict.get("compress") in ("gzip", "gzip_invalid"):
@@ -48,6 +49,10 @@ class EchoServer:
                 resp_body = resp_body[5:]
             resp_headers.extend([[b"content-encoding", b"gzip"], [b"x-content-encoding", b"gzip"]])
 
+        if echo_only_body:
+            # Raw body is sent with a known length instead of chunked transfer encoding
+            resp_headers.append([b"content-length", str(len(resp_body)).encode()])
+
         for k, v in query:
             if k == "header_repeat":
                 val, count = v.split(":", 1)
@@ -70,12 +75,3 @@ class EchoServer:
             await send({"type": "http.response.body", "body": part2})
         else:
             await send({"type": "http.response.body", "body": resp_body})
-
-
-def json_dump(obj: Any) -> bytes:
-    def default(val: Any) -> Any:
-        if isinstance(val, bytes):
-            return val.decode("utf-8")
-        raise TypeError
-
-    return json.dumps(obj, default=default).encode()
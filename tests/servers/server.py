@@ -110,14 +110,23 @@ def is_port_free(port: int) -> bool:
 
 
 def find_free_port(*, not_in_ports: set[int] | None = None, timeout: timedelta = timedelta(seconds=5)) -> int:
-    not_in_ports = not_in_ports or set()
+    return find_free_ports(1, not_in_ports=not_in_ports, timeout=timeout)[0]
+
+
+def find_free_ports(
+    count: int, *, not_in_ports: set[int] | None = None, timeout: timedelta = timedelta(seconds=5)
+) -> list[int]:
+    excluded = set(not_in_ports or ())
+    ports: list[int] = []
     deadline = time.monotonic() + timeout.total_seconds()
-    while True:
+    while len(ports) < count:
         port = random.randint(49152, 60999)
-        if port not in not_in_ports and is_port_free(port):
-            return port
-        if time.monotonic() > deadline:
+        if port not in excluded and is_port_free(port):
+            ports.append(port)
+            excluded.add(port)
+        elif time.monotonic() > deadline:
             raise TimeoutError("Could not find a free port")
+    return ports
 
 
 async def receive_all(receive: Callable[[], Awaitable[dict[str, Any]]]) -> AsyncIterable[bytes]:
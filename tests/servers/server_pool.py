@@ -4,7 +4,7 @@ from collections.abc import AsyncGenerator
 from contextlib import asynccontextmanager
 from typing import Self
 
-from .server import ASGIApp, ServerConfig, find_free_port
+from .server import ASGIApp, ServerConfig, find_free_ports
 from .server_subprocess import SubprocessServer
 
 
@@ -41,17 +41,17 @@ class ServerPool:
         self, pool: asyncio.Queue[SubprocessServer], server_type: type[ASGIApp], config: ServerConfig
     ) -> None:
         if pool.qsize() < 2:
-            for _ in range(2):
-                await self._start_new(pool, server_type, config)
+            # Servers start in separate processes, so they can be waited for concurrently
+            ports = find_free_ports(2, not_in_ports=self._ports)
+            await asyncio.gather(*(self._start_new(pool, server_type, config, port) for port in ports))
 
     async def _start_new(
         self,
         pool: asyncio.Queue[SubprocessServer],
         server_type: type[ASGIApp],
         config: ServerConfig,
-        port: int | None = None,
+        port: int,
     ) -> None:
-        port = port or find_free_port(not_in_ports=self._ports)
         self._ports.add(port)
         await pool.put(await SubprocessServer.start(server_type, config, port))
 